@@ -0,0 +1,51 @@
+"""hot query indexes
+
+Revision ID: 0003_hot_query_indexes
+Revises: 0002_add_diary_entries
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003_hot_query_indexes"
+down_revision = "0002_add_diary_entries"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps events writable while the indexes build on large tables.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_events_program_type_occurred",
+            "events",
+            ["program_id", "event_type", "occurred_at"],
+            postgresql_include=["amount", "intensity"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_events_program_occurred",
+            "events",
+            ["program_id", "occurred_at"],
+            postgresql_include=["event_type", "amount"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_programs_user_active",
+            "programs",
+            ["user_id"],
+            postgresql_where=sa.text("is_active IS TRUE"),
+            postgresql_concurrently=True,
+        )
+        # Left prefix of both composite event indexes.
+        op.drop_index("ix_events_program_id", table_name="events", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_events_program_id", "events", ["program_id"], postgresql_concurrently=True)
+        op.drop_index("ix_programs_user_active", table_name="programs", postgresql_concurrently=True)
+        op.drop_index("ix_events_program_occurred", table_name="events", postgresql_concurrently=True)
+        op.drop_index("ix_events_program_type_occurred", table_name="events", postgresql_concurrently=True)
@@ -0,0 +1,79 @@
+"""add event daily stats rollup
+
+Revision ID: 0004_event_daily_stats
+Revises: 0003_hot_query_indexes
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision = "0004_event_daily_stats"
+down_revision = "0003_hot_query_indexes"
+branch_labels = None
+depends_on = None
+
+COUNT_COLUMNS = (
+    "use_count",
+    "relapse_count",
+    "craving_count",
+    "craving_intensity_sum",
+    "craving_intensity_count",
+    "trigger_stress",
+    "trigger_social",
+    "trigger_alcohol",
+    "trigger_boredom",
+    "trigger_morning",
+    "trigger_after_meal",
+    "trigger_other",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "event_daily_stats",
+        sa.Column("program_id", pg.UUID(as_uuid=True), sa.ForeignKey("programs.id"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("use_amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        sa.Column("relapse_amount", sa.Numeric(12, 2), nullable=False, server_default="0"),
+        *(sa.Column(name, sa.Integer(), nullable=False, server_default="0") for name in COUNT_COLUMNS),
+        sa.Column("craving_intensity_max", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    # Backfill from existing events, bucketed by UTC day.
+    op.execute(
+        """
+        INSERT INTO event_daily_stats (
+            program_id, day, use_amount, use_count, relapse_amount, relapse_count,
+            craving_count, craving_intensity_sum, craving_intensity_count, craving_intensity_max,
+            trigger_stress, trigger_social, trigger_alcohol, trigger_boredom,
+            trigger_morning, trigger_after_meal, trigger_other
+        )
+        SELECT
+            program_id,
+            (occurred_at AT TIME ZONE 'UTC')::date,
+            COALESCE(SUM(amount) FILTER (WHERE event_type = 'use'), 0),
+            COUNT(*) FILTER (WHERE event_type = 'use'),
+            COALESCE(SUM(amount) FILTER (WHERE event_type = 'relapse'), 0),
+            COUNT(*) FILTER (WHERE event_type = 'relapse'),
+            COUNT(*) FILTER (WHERE event_type = 'craving'),
+            COALESCE(SUM(intensity) FILTER (WHERE event_type = 'craving'), 0),
+            COUNT(intensity) FILTER (WHERE event_type = 'craving'),
+            MAX(intensity) FILTER (WHERE event_type = 'craving'),
+            COUNT(*) FILTER (WHERE trigger = 'stress'),
+            COUNT(*) FILTER (WHERE trigger = 'social'),
+            COUNT(*) FILTER (WHERE trigger = 'alcohol'),
+            COUNT(*) FILTER (WHERE trigger = 'boredom'),
+            COUNT(*) FILTER (WHERE trigger = 'morning'),
+            COUNT(*) FILTER (WHERE trigger = 'after_meal'),
+            COUNT(*) FILTER (WHERE trigger = 'other')
+        FROM events
+        GROUP BY program_id, (occurred_at AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_daily_stats")
@@ -0,0 +1,37 @@
+"""add progress snapshots
+
+Revision ID: 0005_progress_snapshots
+Revises: 0004_event_daily_stats
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision = "0005_progress_snapshots"
+down_revision = "0004_event_daily_stats"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "progress_snapshots",
+        sa.Column("program_id", pg.UUID(as_uuid=True), sa.ForeignKey("programs.id"), primary_key=True),
+        sa.Column("snapshot_date", sa.Date(), primary_key=True),
+        sa.Column("progress_percent", sa.Numeric(5, 2), nullable=False),
+        sa.Column("days_since_start", sa.Integer(), nullable=False),
+        sa.Column("baseline_daily_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("recent_average_daily_amount", sa.Numeric(10, 2), nullable=False),
+        sa.Column("reduction_progress", sa.Numeric(6, 4), nullable=False),
+        sa.Column("relapse_penalty", sa.Numeric(6, 4), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_progress_snapshots_snapshot_date", "progress_snapshots", ["snapshot_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_progress_snapshots_snapshot_date", table_name="progress_snapshots")
+    op.drop_table("progress_snapshots")
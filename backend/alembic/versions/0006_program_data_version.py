@@ -0,0 +1,25 @@
+"""add program data version
+
+Revision ID: 0006_program_data_version
+Revises: 0005_progress_snapshots
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006_program_data_version"
+down_revision = "0005_progress_snapshots"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("programs", sa.Column("data_version", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("programs", sa.Column("data_changed_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("programs", "data_changed_at")
+    op.drop_column("programs", "data_version")
@@ -0,0 +1,39 @@
+"""refresh token purge indexes
+
+Revision ID: 0007_refresh_token_purge_indexes
+Revises: 0006_program_data_version
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007_refresh_token_purge_indexes"
+down_revision = "0006_program_data_version"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY keeps logins and refreshes writing while the indexes build.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_refresh_tokens_expires_at",
+            "refresh_tokens",
+            ["expires_at"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_refresh_tokens_revoked_at",
+            "refresh_tokens",
+            ["revoked_at"],
+            postgresql_where=sa.text("revoked_at IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_refresh_tokens_revoked_at", table_name="refresh_tokens", postgresql_concurrently=True)
+        op.drop_index("ix_refresh_tokens_expires_at", table_name="refresh_tokens", postgresql_concurrently=True)
@@ -0,0 +1,23 @@
+"""add user deletion requested at
+
+Revision ID: 0008_user_deletion_requested_at
+Revises: 0007_refresh_token_purge_indexes
+Create Date: 2026-10-17 00:00:00
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008_user_deletion_requested_at"
+down_revision = "0007_refresh_token_purge_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("users", sa.Column("deletion_requested_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("users", "deletion_requested_at")
@@ -0,0 +1,89 @@
+"""Conditional GET support for program-scoped read endpoints.
+
+Validators come from the active program's data version, so a matching
+request is answered with ``304`` before any rows are loaded.
+"""
+
+import hashlib
+import uuid
+from datetime import date, datetime, time, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from app.services.active_program import ActiveProgram
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def program_validators(
+    request: Request,
+    user_id: uuid.UUID,
+    program: ActiveProgram | None,
+    day: date | None = None,
+    variant: str = "",
+) -> tuple[str, datetime | None]:
+    """Weak ETag and Last-Modified for ``request`` against ``program``'s watermark.
+
+    ``day`` is given by endpoints whose output also changes at UTC midnight;
+    ``variant`` names a representation negotiated outside the query string.
+    """
+    watermark = f"{program.id}:{program.data_version}" if program else "none"
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    raw = f"{user_id}|{watermark}|{request.url.path}|{query}|{day or ''}|{variant}"
+    etag = f'W/"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+    last_modified = program.data_changed_at if program else None
+    if last_modified is not None and last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=timezone.utc)
+    if day is not None:
+        day_start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+        last_modified = max(last_modified, day_start) if last_modified else day_start
+    return etag, last_modified
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _not_modified_since(header: str, last_modified: datetime | None) -> bool:
+    if last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified.replace(microsecond=0) <= since
+
+
+def not_modified(
+    request: Request,
+    response: Response,
+    user_id: uuid.UUID,
+    program: ActiveProgram | None,
+    day: date | None = None,
+    variant: str = "",
+) -> Response | None:
+    """Set validators on ``response``; return a ``304`` if the client's copy is current."""
+    etag, last_modified = program_validators(request, user_id, program, day, variant)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        fresh = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        fresh = if_modified_since is not None and _not_modified_since(if_modified_since, last_modified)
+    if not fresh:
+        return None
+    return Response(status_code=304, headers=headers)
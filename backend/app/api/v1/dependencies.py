@@ -0,0 +1,31 @@
+import uuid
+
+from fastapi import Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.replica import get_read_db
+from app.db.session import get_db
+from app.security.dependencies import get_current_user_id
+from app.services.active_program import ActiveProgram, load_active_program
+
+
+def require_active_program(db: Session, user_id: uuid.UUID, use_cache: bool = True) -> ActiveProgram:
+    program = load_active_program(db, user_id, use_cache=use_cache)
+    if not program:
+        raise HTTPException(status_code=404, detail="No active program")
+    return program
+
+
+def get_active_program(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: Session = Depends(get_read_db),
+) -> ActiveProgram:
+    return require_active_program(db, user_id)
+
+
+def get_active_program_for_write(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> ActiveProgram:
+    # Writes must never attach rows to a program another worker just deactivated.
+    return require_active_program(db, user_id, use_cache=False)
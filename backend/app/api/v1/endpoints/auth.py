@@ -1,27 +1,28 @@
 from datetime import datetime, timedelta, timezone
 import uuid
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
 from app.models.models import RefreshToken, User
 from app.schemas.auth import UserRegister, UserLogin, TokenPair, TokenRefresh
-from app.security.passwords import verify_password, hash_password, validate_password_strength
+from app.security.passwords import verify_and_update_password, hash_password, validate_password_strength
 from app.security.jwt import create_access_token, create_refresh_token, decode_token
+from app.services.refresh_tokens import cap_live_tokens
 from app.config import settings
 
 router = APIRouter()
 
 
-@router.post("/register", response_model=TokenPair)
-def register(payload: UserRegister, db: Session = Depends(get_db)):
-    validate_password_strength(payload.password)
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="User already registered")
+def _email_registered(db: Session, email: str) -> bool:
+    return db.query(User).filter(User.email == email).first() is not None
 
-    user = User(email=payload.email, password_hash=hash_password(payload.password))
+
+def _create_user(db: Session, email: str, password_hash: str) -> TokenPair:
+    user = User(email=email, password_hash=password_hash)
     try:
         db.add(user)
         db.commit()
@@ -50,49 +51,94 @@ def register(payload: UserRegister, db: Session = Depends(get_db)):
     return TokenPair(access_token=access_token, refresh_token=refresh_token)
 
 
-@router.post("/login", response_model=TokenPair)
-def login(payload: UserLogin, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == payload.email).first()
-    if not user or not verify_password(payload.password, user.password_hash):
+# Register and login are async so a request waiting for the password pool
+# holds no threadpool thread; their database work still runs in the threadpool.
+@router.post("/register", response_model=TokenPair)
+async def register(payload: UserRegister, db: Session = Depends(get_db)):
+    validate_password_strength(payload.password)
+    if await run_in_threadpool(_email_registered, db, payload.email):
+        raise HTTPException(status_code=400, detail="User already registered")
+
+    password_hash = await hash_password(payload.password)
+    return await run_in_threadpool(_create_user, db, payload.email, password_hash)
+
+
+def _load_login_user(db: Session, email: str) -> User:
+    user = db.query(User).filter(User.email == email).first()
+    if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    return user
+
+
+def _start_session(db: Session, user: User, new_hash: str | None) -> TokenPair:
+    if new_hash:
+        # Stored with older Argon2 parameters; upgrade while the plaintext is at hand.
+        user.password_hash = new_hash
 
     access_token = create_access_token(user.id)
     refresh_token, jti = create_refresh_token(user.id)
 
+    now = datetime.now(timezone.utc)
     db.add(RefreshToken(
         user_id=user.id,
         jti=jti,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days),
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days),
     ))
+    # Only login adds a session; refresh rotation keeps the live count unchanged.
+    cap_live_tokens(db, user.id, now)
     db.commit()
 
     return TokenPair(access_token=access_token, refresh_token=refresh_token)
 
 
+@router.post("/login", response_model=TokenPair)
+async def login(payload: UserLogin, db: Session = Depends(get_db)):
+    user = await run_in_threadpool(_load_login_user, db, payload.email)
+    valid, new_hash = await verify_and_update_password(payload.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    return await run_in_threadpool(_start_session, db, user, new_hash)
+
+
 @router.post("/refresh", response_model=TokenPair)
 def refresh(payload: TokenRefresh, db: Session = Depends(get_db)):
     decoded = decode_token(payload.refresh_token)
     if decoded.get("type") != "refresh":
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    jti = decoded.get("jti")
-    token_row = db.query(RefreshToken).filter(RefreshToken.jti == jti).first()
-    if not token_row or token_row.revoked_at is not None:
-        raise HTTPException(status_code=401, detail="Invalid token")
-
-    if token_row.expires_at < datetime.now(timezone.utc):
-        raise HTTPException(status_code=401, detail="Token expired")
-
     user_id = uuid.UUID(decoded.get("sub"))
     access_token = create_access_token(user_id)
     new_refresh_token, new_jti = create_refresh_token(user_id)
 
-    token_row.revoked_at = datetime.now(timezone.utc)
-    token_row.replaced_by = new_jti
+    # Claim the old token in one conditional UPDATE: of several concurrent
+    # refreshes with the same token only one matches, the rest get 401.
+    now = datetime.now(timezone.utc)
+    rotated = db.execute(
+        update(RefreshToken)
+        .where(
+            RefreshToken.jti == decoded.get("jti"),
+            RefreshToken.revoked_at.is_(None),
+            RefreshToken.expires_at > now,
+        )
+        .values(revoked_at=now, replaced_by=new_jti)
+        .returning(RefreshToken.user_id),
+        execution_options={"synchronize_session": False},
+    ).first()
+    if rotated is None:
+        db.rollback()
+        expired = db.execute(
+            select(RefreshToken.id).where(
+                RefreshToken.jti == decoded.get("jti"),
+                RefreshToken.revoked_at.is_(None),
+                RefreshToken.expires_at <= now,
+            )
+        ).first()
+        raise HTTPException(status_code=401, detail="Token expired" if expired else "Invalid token")
+
     db.add(RefreshToken(
-        user_id=user_id,
+        user_id=rotated.user_id,
         jti=new_jti,
-        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.refresh_token_expire_days),
+        expires_at=now + timedelta(days=settings.refresh_token_expire_days),
     ))
     db.commit()
 
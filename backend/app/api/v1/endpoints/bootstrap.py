@@ -0,0 +1,63 @@
+from datetime import datetime, time, timedelta, timezone
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from app.api.v1.pagination import split_page
+from app.config import settings
+from app.db.replica import get_read_db
+from app.models.enums import EventType
+from app.models.models import DiaryEntry, Event
+from app.schemas.bootstrap import BootstrapOut
+from app.security.dependencies import Principal, get_current_principal
+from app.services.active_program import cached_active_program
+from app.services.dashboard import load_dashboard
+
+router = APIRouter()
+
+
+@router.get("", response_model=BootstrapOut)
+def get_bootstrap(
+    db: Session = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+    days: int = Query(default=30, ge=1, le=366),
+):
+    """Everything the app needs for its first screen, resolved once on one session."""
+    now = datetime.now(timezone.utc)
+    result = load_dashboard(db, current_user.id, now, program=cached_active_program(db, current_user.id))
+    if result is None:
+        return BootstrapOut(user=current_user, active_program=None, dashboard=None, diary=[], cravings=[])
+    program, dashboard = result
+
+    since = now.date() - timedelta(days=days - 1)
+    limit = settings.list_page_size_max
+    diary, diary_next_cursor = split_page(
+        db.query(DiaryEntry)
+        .filter(DiaryEntry.program_id == program.id, DiaryEntry.entry_date >= since)
+        .order_by(DiaryEntry.entry_date.desc())
+        .limit(limit + 1)
+        .all(),
+        limit,
+        key=lambda entry: (entry.entry_date,),
+    )
+    cravings, cravings_next_cursor = split_page(
+        db.query(Event)
+        .filter(
+            Event.program_id == program.id,
+            Event.event_type == EventType.craving.value,
+            Event.occurred_at >= datetime.combine(since, time.min, tzinfo=timezone.utc),
+        )
+        .order_by(Event.occurred_at.desc(), Event.id.desc())
+        .limit(limit + 1)
+        .all(),
+        limit,
+        key=lambda event: (event.occurred_at, event.id),
+    )
+    return BootstrapOut(
+        user=current_user,
+        active_program=program,
+        dashboard=dashboard,
+        diary=diary,
+        cravings=cravings,
+        diary_next_cursor=diary_next_cursor,
+        cravings_next_cursor=cravings_next_cursor,
+    )
@@ -0,0 +1,20 @@
+import uuid
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.endpoints import dashboard
+from app.db.replica import get_async_read_db
+from app.schemas.progress import DashboardOut
+from app.security.dependencies import get_current_user_id
+
+router = APIRouter()
+
+
+@router.get("", response_model=DashboardOut)
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    return await db.run_sync(lambda session: dashboard.get_dashboard(request, response, db=session, user_id=user_id))
@@ -1,34 +1,43 @@
 from datetime import date, datetime, timezone
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
+from app.api.v1.conditional import not_modified
+from app.api.v1.dependencies import get_active_program, get_active_program_for_write
+from app.api.v1.pagination import decode_cursor, fetch_page
+from app.api.v1.responses import ListFormat, columnar_response, list_format, rows_response
 from app.config import settings
+from app.db.replica import get_read_db, mark_write
 from app.db.session import get_db
-from app.models.models import DiaryEntry, Program, User
+from app.models.models import DiaryEntry
 from app.schemas.diary import DiaryEntryCreate, DiaryEntryOut
-from app.security.dependencies import get_current_user
+from app.services.active_program import ActiveProgram, bump_data_version, invalidate_active_program
+from app.services.export import (
+    DIARY_COLUMNS,
+    MEDIA_TYPES,
+    ExportFormat,
+    content_disposition,
+    diary_export_statement,
+    iter_export,
+)
 
 router = APIRouter()
 
+# Fields charts read from the columnar format.
+COLUMNAR_FIELDS = ("entry_date", "mood")
+
 
 def _now_utc() -> datetime:
     return datetime.now(timezone.utc)
 
 
-def _get_active_program(db: Session, user_id):
-    return (
-        db.query(Program)
-        .filter(Program.user_id == user_id, Program.is_active.is_(True))
-        .first()
-    )
-
-
 @router.post("", response_model=DiaryEntryOut)
 def create_diary_entry(
     payload: DiaryEntryCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    program: ActiveProgram = Depends(get_active_program_for_write),
 ):
     now = _now_utc()
     if now.hour < settings.diary_log_start_hour:
@@ -37,10 +46,6 @@ def create_diary_entry(
             detail=f"Diary logging is available after {settings.diary_log_start_hour:02d}:00 UTC.",
         )
 
-    program = _get_active_program(db, current_user.id)
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
-
     today = now.date()
     existing = (
         db.query(DiaryEntry)
@@ -57,26 +62,61 @@ def create_diary_entry(
         note=payload.note,
     )
     db.add(entry)
+    bump_data_version(db, program.id)
     db.commit()
+    invalidate_active_program(db, program.user_id)
+    mark_write(program.user_id)
     db.refresh(entry)
     return entry
 
 
 @router.get("", response_model=list[DiaryEntryOut])
 def list_diary_entries(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
     start: date | None = Query(default=None),
     end: date | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    format: ListFormat | None = Query(default=None),
 ):
-    program = _get_active_program(db, current_user.id)
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
-
-    query = db.query(DiaryEntry).filter(DiaryEntry.program_id == program.id)
+    representation = list_format(request, format)
+    unchanged = not_modified(request, response, program.user_id, program, variant=representation.value)
+    if unchanged is not None:
+        return unchanged
+
+    columnar = representation is ListFormat.columnar
+    fields = COLUMNAR_FIELDS if columnar else tuple(DiaryEntryOut.model_fields)
+    query = db.query(*(getattr(DiaryEntry, name) for name in fields)).filter(DiaryEntry.program_id == program.id)
     if start:
         query = query.filter(DiaryEntry.entry_date >= start)
     if end:
         query = query.filter(DiaryEntry.entry_date <= end)
-
-    return query.order_by(DiaryEntry.entry_date.desc(), DiaryEntry.created_at.desc()).all()
+    if cursor:
+        # entry_date is unique per program (uq_diary_program_date), so it is a complete keyset.
+        (after,) = decode_cursor(cursor, (date.fromisoformat,))
+        query = query.filter(DiaryEntry.entry_date < after)
+
+    query = query.order_by(DiaryEntry.entry_date.desc(), DiaryEntry.created_at.desc())
+    page = fetch_page(query, limit, response, key=lambda entry: (entry.entry_date,))
+    if columnar:
+        return columnar_response(page, COLUMNAR_FIELDS, ("entry_date",), response)
+    return rows_response(page, response)
+
+
+@router.get("/export")
+def export_diary_entries(
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+):
+    statement = diary_export_statement(program.id, start, end)
+    return StreamingResponse(
+        iter_export(db.get_bind(), statement, DIARY_COLUMNS, format),
+        media_type=MEDIA_TYPES[format],
+        headers=content_disposition("diary", format),
+    )
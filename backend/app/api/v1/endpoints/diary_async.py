@@ -0,0 +1,83 @@
+import uuid
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import require_active_program
+from app.api.v1.endpoints import diary
+from app.api.v1.responses import ListFormat
+from app.db.replica import get_async_read_db
+from app.db.session import get_async_db
+from app.schemas.diary import DiaryEntryCreate, DiaryEntryOut
+from app.services.export import (
+    DIARY_COLUMNS,
+    MEDIA_TYPES,
+    ExportFormat,
+    aiter_export,
+    content_disposition,
+    diary_export_statement,
+)
+from app.security.dependencies import get_current_user_id
+
+router = APIRouter()
+
+
+@router.post("", response_model=DiaryEntryOut)
+async def create_diary_entry(
+    payload: DiaryEntryCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    return await db.run_sync(
+        lambda session: diary.create_diary_entry(
+            payload,
+            db=session,
+            program=require_active_program(session, user_id, use_cache=False),
+        )
+    )
+
+
+@router.get("", response_model=list[DiaryEntryOut])
+async def list_diary_entries(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    format: ListFormat | None = Query(default=None),
+):
+    return await db.run_sync(
+        lambda session: diary.list_diary_entries(
+            request,
+            response,
+            db=session,
+            program=require_active_program(session, user_id),
+            start=start,
+            end=end,
+            limit=limit,
+            cursor=cursor,
+            format=format,
+        )
+    )
+
+
+@router.get("/export")
+async def export_diary_entries(
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+):
+    program = await db.run_sync(lambda session: require_active_program(session, user_id))
+    statement = diary_export_statement(program.id, start, end)
+    return StreamingResponse(
+        aiter_export(db.bind, statement, DIARY_COLUMNS, format),
+        media_type=MEDIA_TYPES[format],
+        headers=content_disposition("diary", format),
+    )
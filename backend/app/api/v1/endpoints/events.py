@@ -1,34 +1,45 @@
+import uuid
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Any
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, tuple_
 from sqlalchemy.orm import Session
 
+from app.api.v1.conditional import not_modified
+from app.api.v1.dependencies import get_active_program, get_active_program_for_write
+from app.api.v1.pagination import decode_cursor, fetch_page
+from app.api.v1.responses import ListFormat, columnar_response, list_format, rows_response
+from app.config import settings
+from app.db.replica import get_read_db, mark_write
 from app.db.session import get_db
 from app.models.enums import EventType
-from app.models.models import Event, Program, User
-from app.schemas.event import EventCreate, EventOut
-from app.security.dependencies import get_current_user
+from app.models.models import Event
+from app.schemas.event import EventBatchItemError, EventBatchOut, EventCreate, EventCreateList, EventOut
+from app.services.active_program import ActiveProgram, bump_data_version, invalidate_active_program
+from app.services.daily_stats import record_events
+from app.services.export import (
+    EVENT_COLUMNS,
+    MEDIA_TYPES,
+    ExportFormat,
+    content_disposition,
+    event_export_statement,
+    iter_export,
+)
 
 router = APIRouter()
 
-
-def get_active_program(db: Session, user_id):
-    return (
-        db.query(Program)
-        .filter(Program.user_id == user_id, Program.is_active.is_(True))
-        .first()
-    )
+# Fields charts read from the columnar format; ``id`` and ``notes`` are left out.
+COLUMNAR_FIELDS = ("occurred_at", "event_type", "amount", "intensity", "trigger")
 
 
 @router.post("", response_model=EventOut)
 def create_event(
     payload: EventCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    program: ActiveProgram = Depends(get_active_program_for_write),
 ):
-    program = get_active_program(db, current_user.id)
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
-
     event = Event(
         program_id=program.id,
         event_type=payload.event_type.value,
@@ -39,30 +50,123 @@ def create_event(
         occurred_at=payload.occurred_at,
     )
     db.add(event)
+    record_events(db, program.id, [event])
+    bump_data_version(db, program.id)
     db.commit()
+    invalidate_active_program(db, program.user_id)
+    mark_write(program.user_id)
     db.refresh(event)
     return event
 
 
+def _validate_batch(items: list[Any]) -> tuple[list[tuple[int, EventCreate]], list[EventBatchItemError]]:
+    try:
+        return list(enumerate(EventCreateList.validate_python(items))), []
+    except ValidationError as exc:
+        messages: dict[int, list[str]] = {}
+        for error in exc.errors():
+            index, *loc = error["loc"]
+            field = ".".join(str(part) for part in loc)
+            messages.setdefault(index, []).append(f"{field}: {error['msg']}" if field else error["msg"])
+
+    valid_indexes = [index for index in range(len(items)) if index not in messages]
+    valid = EventCreateList.validate_python([items[index] for index in valid_indexes])
+    errors = [EventBatchItemError(index=index, errors=msgs) for index, msgs in sorted(messages.items())]
+    return list(zip(valid_indexes, valid)), errors
+
+
+@router.post("/batch", response_model=EventBatchOut)
+def create_events_batch(
+    payload: list[Any] = Body(...),
+    db: Session = Depends(get_db),
+    program: ActiveProgram = Depends(get_active_program_for_write),
+):
+    """Insert queued events in one transaction; invalid items are reported, valid ones kept."""
+    if len(payload) > settings.event_batch_max_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: at most {settings.event_batch_max_size} events per request.",
+        )
+
+    valid, errors = _validate_batch(payload)
+    if not valid:
+        return EventBatchOut(created=[], errors=errors)
+
+    rows = [
+        {
+            "program_id": program.id,
+            "event_type": item.event_type.value,
+            "amount": item.amount,
+            "intensity": item.intensity,
+            "trigger": item.trigger.value if item.trigger else None,
+            "notes": item.notes,
+            "occurred_at": item.occurred_at,
+        }
+        for _, item in valid
+    ]
+    # render_nulls keeps every row on the same column list, so the batch is one multi-row INSERT.
+    statement = insert(Event).returning(Event, sort_by_parameter_order=True)
+    events = db.scalars(statement, rows, execution_options={"render_nulls": True}).all()
+    record_events(db, program.id, events)
+    bump_data_version(db, program.id)
+    created = [EventOut.model_validate(event) for event in events]
+    db.commit()
+    invalidate_active_program(db, program.user_id)
+    mark_write(program.user_id)
+    return EventBatchOut(created=created, errors=errors)
+
+
 @router.get("", response_model=list[EventOut])
 def list_events(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
     start: datetime | None = Query(default=None),
     end: datetime | None = Query(default=None),
     event_type: EventType | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    format: ListFormat | None = Query(default=None),
 ):
-    program = get_active_program(db, current_user.id)
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
+    representation = list_format(request, format)
+    unchanged = not_modified(request, response, program.user_id, program, variant=representation.value)
+    if unchanged is not None:
+        return unchanged
 
-    query = db.query(Event).filter(Event.program_id == program.id)
+    columnar = representation is ListFormat.columnar
+    # ``id`` is always read because it is part of the keyset cursor.
+    fields = ("id", *COLUMNAR_FIELDS) if columnar else tuple(EventOut.model_fields)
+    query = db.query(*(getattr(Event, name) for name in fields)).filter(Event.program_id == program.id)
     if start:
         query = query.filter(Event.occurred_at >= start)
     if end:
         query = query.filter(Event.occurred_at <= end)
     if event_type:
         query = query.filter(Event.event_type == event_type.value)
+    if cursor:
+        after = decode_cursor(cursor, (datetime.fromisoformat, uuid.UUID))
+        query = query.filter(tuple_(Event.occurred_at, Event.id) < after)
+
+    query = query.order_by(Event.occurred_at.desc(), Event.id.desc())
+    page = fetch_page(query, limit, response, key=lambda event: (event.occurred_at, event.id))
+    if columnar:
+        return columnar_response(page, COLUMNAR_FIELDS, ("occurred_at",), response)
+    return rows_response(page, response)
 
-    return query.order_by(Event.occurred_at.desc()).all()
 
+@router.get("/export")
+def export_events(
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    event_type: EventType | None = Query(default=None),
+):
+    statement = event_export_statement(program.id, start, end, event_type)
+    return StreamingResponse(
+        iter_export(db.get_bind(), statement, EVENT_COLUMNS, format),
+        media_type=MEDIA_TYPES[format],
+        headers=content_disposition("events", format),
+    )
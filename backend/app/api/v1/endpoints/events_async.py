@@ -0,0 +1,106 @@
+import uuid
+from datetime import datetime
+from typing import Any
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import require_active_program
+from app.api.v1.endpoints import events
+from app.api.v1.responses import ListFormat
+from app.db.replica import get_async_read_db
+from app.db.session import get_async_db
+from app.models.enums import EventType
+from app.schemas.event import EventBatchOut, EventCreate, EventOut
+from app.services.export import (
+    EVENT_COLUMNS,
+    MEDIA_TYPES,
+    ExportFormat,
+    aiter_export,
+    content_disposition,
+    event_export_statement,
+)
+from app.security.dependencies import get_current_user_id
+
+router = APIRouter()
+
+
+# Handlers reuse the sync implementations through ``AsyncSession.run_sync``:
+# the queries run on the async driver without holding a threadpool slot.
+
+
+@router.post("", response_model=EventOut)
+async def create_event(
+    payload: EventCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    return await db.run_sync(
+        lambda session: events.create_event(
+            payload,
+            db=session,
+            program=require_active_program(session, user_id, use_cache=False),
+        )
+    )
+
+
+@router.post("/batch", response_model=EventBatchOut)
+async def create_events_batch(
+    payload: list[Any] = Body(...),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    return await db.run_sync(
+        lambda session: events.create_events_batch(
+            payload,
+            db=session,
+            program=require_active_program(session, user_id, use_cache=False),
+        )
+    )
+
+
+@router.get("", response_model=list[EventOut])
+async def list_events(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    event_type: EventType | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1),
+    cursor: str | None = Query(default=None),
+    format: ListFormat | None = Query(default=None),
+):
+    return await db.run_sync(
+        lambda session: events.list_events(
+            request,
+            response,
+            db=session,
+            program=require_active_program(session, user_id),
+            start=start,
+            end=end,
+            event_type=event_type,
+            limit=limit,
+            cursor=cursor,
+            format=format,
+        )
+    )
+
+
+@router.get("/export")
+async def export_events(
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    format: ExportFormat = Query(default=ExportFormat.ndjson),
+    start: datetime | None = Query(default=None),
+    end: datetime | None = Query(default=None),
+    event_type: EventType | None = Query(default=None),
+):
+    program = await db.run_sync(lambda session: require_active_program(session, user_id))
+    statement = event_export_statement(program.id, start, end, event_type)
+    return StreamingResponse(
+        aiter_export(db.bind, statement, EVENT_COLUMNS, format),
+        media_type=MEDIA_TYPES[format],
+        headers=content_disposition("events", format),
+    )
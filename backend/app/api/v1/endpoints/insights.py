@@ -0,0 +1,45 @@
+from datetime import date, datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.orm import Session
+
+from app.api.v1.conditional import not_modified
+from app.api.v1.dependencies import get_active_program
+from app.config import settings
+from app.db.replica import get_read_db
+from app.schemas.insights import DailyInsightsOut
+from app.services.active_program import ActiveProgram
+from app.services.insights import build_daily_insights, load_daily_rows
+
+router = APIRouter()
+
+
+def _check_range(start: date, end: date) -> None:
+    if end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+    if (end - start).days + 1 > settings.insights_max_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range too long: at most {settings.insights_max_days} days.",
+        )
+
+
+@router.get("/daily", response_model=DailyInsightsOut)
+def get_daily_insights(
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
+    start: date | None = Query(default=None),
+    end: date | None = Query(default=None),
+):
+    today = datetime.now(timezone.utc).date()
+    start = start or date(today.year, 1, 1)
+    end = end or max(today, start)
+    _check_range(start, end)
+
+    unchanged = not_modified(request, response, program.user_id, program, day=today)
+    if unchanged is not None:
+        return unchanged
+
+    rows = load_daily_rows(db, program.id, start, end)
+    return build_daily_insights(rows, start, end)
@@ -0,0 +1,24 @@
+import secrets
+
+from fastapi import APIRouter, Header, HTTPException
+
+from app.config import settings
+from app.db.pool import pool_status
+
+router = APIRouter()
+
+
+def _ensure_internal_access(token: str | None) -> None:
+    if settings.internal_api_token:
+        if not token or not secrets.compare_digest(token, settings.internal_api_token):
+            raise HTTPException(status_code=403, detail="Invalid internal token")
+        return
+    env = settings.environment.strip().lower()
+    if env not in {"test", "development"}:
+        raise HTTPException(status_code=403, detail="Internal endpoints require INTERNAL_API_TOKEN in this environment.")
+
+
+@router.get("/db-pool")
+def get_db_pool_stats(x_internal_token: str | None = Header(default=None)):
+    _ensure_internal_access(x_internal_token)
+    return pool_status()
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, BackgroundTasks, Depends, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 from app.schemas.user import UserOut, UserUpdate, UserPasswordUpdate
-from app.security.dependencies import get_current_user
+from app.security.dependencies import Principal, get_current_principal, get_current_user, invalidate_principal
 from app.security.passwords import hash_password, validate_password_strength
+from app.services.account_deletion import (
+    deactivate_account,
+    delete_account,
+    is_large_account,
+    purge_account_in_chunks,
+)
+from app.services.active_program import invalidate_active_program
 from app.models.models import User
 
 router = APIRouter()
 
 
 @router.get("", response_model=UserOut)
-def get_me(current_user: User = Depends(get_current_user)):
+def get_me(current_user: Principal = Depends(get_current_principal)):
     return current_user
 
 
@@ -24,28 +32,49 @@ def update_me(
     if payload.display_name is not None:
         current_user.display_name = payload.display_name
     db.commit()
+    invalidate_principal(current_user.id)
     db.refresh(current_user)
     return current_user
 
 
+def _store_password_hash(db: Session, user: User, password_hash: str) -> None:
+    user.password_hash = password_hash
+    db.commit()
+    invalidate_principal(user.id)
+
+
 @router.patch("/password")
-def update_password(
+async def update_password(
     payload: UserPasswordUpdate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
+    # Async so the wait for the password pool holds no threadpool thread.
     validate_password_strength(payload.password)
-    current_user.password_hash = hash_password(payload.password)
-    db.commit()
+    password_hash = await hash_password(payload.password)
+    await run_in_threadpool(_store_password_hash, db, current_user, password_hash)
     return {"detail": "ok"}
 
 
 @router.delete("")
 def delete_me(
+    response: Response,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    db.delete(current_user)
+    user_id = current_user.id
+    if is_large_account(db, user_id):
+        deactivate_account(db, user_id)
+        db.commit()
+        invalidate_principal(user_id)
+        invalidate_active_program(db, user_id)
+        background_tasks.add_task(purge_account_in_chunks, SessionLocal, user_id)
+        response.status_code = 202
+        return {"detail": "scheduled"}
+
+    delete_account(db, user_id)
     db.commit()
+    invalidate_principal(user_id)
+    invalidate_active_program(db, user_id)
     return {"detail": "ok"}
-
@@ -1,13 +1,17 @@
+import uuid
 from datetime import datetime, timezone, timedelta
 import random
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy import delete, func
 from sqlalchemy.orm import Session
 
+from app.api.v1.conditional import not_modified
+from app.api.v1.dependencies import get_active_program, require_active_program
 from app.config import settings
+from app.db.replica import get_read_db, mark_write
 from app.db.session import get_db
 from app.models.enums import EventType
-from app.models.models import DiaryEntry, Event, ProductProfile, Program, User
+from app.models.models import DiaryEntry, Event, ProductProfile, Program
 from app.schemas.program import (
     ProductProfileCostUpdate,
     ProgramCreate,
@@ -16,7 +20,15 @@ from app.schemas.program import (
     TestResetOut,
     TestSeedDayOut,
 )
-from app.security.dependencies import get_current_user
+from app.security.dependencies import Principal, get_current_principal, get_current_user_id
+from app.services.active_program import (
+    ActiveProgram,
+    bump_data_version,
+    invalidate_active_program,
+    load_active_program,
+    load_active_program_row,
+)
+from app.services.daily_stats import rebuild_daily_stats, record_events
 
 router = APIRouter()
 
@@ -25,13 +37,9 @@ router = APIRouter()
 def create_program(
     payload: ProgramCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    existing_active = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
+    existing_active = load_active_program_row(db, current_user.id)
     if existing_active:
         existing_active.is_active = False
         existing_active.ended_at = datetime.now(timezone.utc)
@@ -41,6 +49,7 @@ def create_program(
         goal_type=payload.goal_type.value,
         started_at=payload.started_at,
         is_active=True,
+        data_changed_at=datetime.now(timezone.utc),
     )
     profile = ProductProfile(
         product_type=payload.product_profile.product_type.value,
@@ -53,22 +62,14 @@ def create_program(
 
     db.add(program)
     db.commit()
+    invalidate_active_program(db, current_user.id)
+    mark_write(current_user.id)
     db.refresh(program)
     return program
 
 
 @router.get("/active", response_model=ProgramOut)
-def get_active_program(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
-):
-    program = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
+def read_active_program(program: ActiveProgram = Depends(get_active_program)):
     return program
 
 
@@ -76,30 +77,36 @@ def get_active_program(
 def update_active_product_profile(
     payload: ProductProfileCostUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
 ):
-    program = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
+    program = load_active_program_row(db, user_id)
     if not program:
         raise HTTPException(status_code=404, detail="No active program")
     if not program.product_profile:
         raise HTTPException(status_code=404, detail="No product profile for active program")
 
     program.product_profile.cost_per_unit = payload.cost_per_unit
+    bump_data_version(db, program.id)
     db.commit()
+    invalidate_active_program(db, user_id)
+    mark_write(user_id)
     db.refresh(program)
     return program
 
 
 @router.get("", response_model=list[ProgramOut])
 def list_programs(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
 ):
-    return db.query(Program).filter(Program.user_id == current_user.id).order_by(Program.started_at.desc()).all()
+    # Creating a program switches the active one and profile edits bump its
+    # version, so the active program is a sufficient watermark for the list.
+    unchanged = not_modified(request, response, user_id, load_active_program(db, user_id))
+    if unchanged is not None:
+        return unchanged
+    return db.query(Program).filter(Program.user_id == user_id).order_by(Program.started_at.desc()).all()
 
 
 def _ensure_test_or_development() -> None:
@@ -111,17 +118,11 @@ def _ensure_test_or_development() -> None:
 @router.post("/active/test/seed-random-day", response_model=TestSeedDayOut)
 def seed_random_test_day(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
 ):
     _ensure_test_or_development()
 
-    program = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
+    program = require_active_program(db, user_id, use_cache=False)
 
     now_utc = datetime.now(timezone.utc)
     today = now_utc.date()
@@ -156,6 +157,7 @@ def seed_random_test_day(
     db.add(diary_entry)
 
     cravings_out: list[TestCravingOut] = []
+    events: list[Event] = []
     for _ in range(craving_count):
         hour = random.randint(0, 23)
         minute = random.randint(0, 59)
@@ -175,9 +177,14 @@ def seed_random_test_day(
             occurred_at=occurred_at,
         )
         db.add(event)
+        events.append(event)
         cravings_out.append(TestCravingOut(occurred_at=occurred_at, intensity=intensity))
 
+    record_events(db, program.id, events)
+    bump_data_version(db, program.id)
     db.commit()
+    invalidate_active_program(db, user_id)
+    mark_write(user_id)
 
     return TestSeedDayOut(
         date=next_date.isoformat(),
@@ -191,23 +198,23 @@ def seed_random_test_day(
 @router.post("/active/test/reset-progress", response_model=TestResetOut)
 def reset_test_progress(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    user_id: uuid.UUID = Depends(get_current_user_id),
 ):
     _ensure_test_or_development()
 
-    program = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
+    program = load_active_program_row(db, user_id)
     if not program:
         raise HTTPException(status_code=404, detail="No active program")
 
     deleted_diary = db.execute(delete(DiaryEntry).where(DiaryEntry.program_id == program.id)).rowcount or 0
     deleted_events = db.execute(delete(Event).where(Event.program_id == program.id)).rowcount or 0
+    rebuild_daily_stats(db, program.id)
     started_at = datetime.now(timezone.utc)
     program.started_at = started_at
+    bump_data_version(db, program.id)
     db.commit()
+    invalidate_active_program(db, user_id)
+    mark_write(user_id)
 
     return TestResetOut(
         ok=True,
@@ -1,44 +1,38 @@
-from datetime import datetime, timezone, timedelta
-from fastapi import APIRouter, Depends, HTTPException
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.models import Event, Program, User
+from app.api.v1.conditional import not_modified
+from app.api.v1.dependencies import get_active_program
+from app.db.replica import get_read_db
 from app.schemas.progress import ProgressOut
-from app.security.dependencies import get_current_user
-from app.services.progress import calculate_progress
+from app.services.active_program import ActiveProgram
+from app.services.daily_stats import load_progress_aggregates_from_rollup
+from app.services.progress import calculate_progress_from_aggregates
+from app.services.progress_cache import progress_cache, progress_cache_key
 
 router = APIRouter()
 
 
 @router.get("", response_model=ProgressOut)
 def get_progress(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    program: ActiveProgram = Depends(get_active_program),
 ):
-    program = (
-        db.query(Program)
-        .filter(Program.user_id == current_user.id, Program.is_active.is_(True))
-        .first()
-    )
-    if not program:
-        raise HTTPException(status_code=404, detail="No active program")
-
     now = datetime.now(timezone.utc)
-    recent_cutoff = now - timedelta(days=7)
-    relapse_cutoff = now - timedelta(days=30)
-
-    recent_events = (
-        db.query(Event)
-        .filter(Event.program_id == program.id, Event.occurred_at >= recent_cutoff)
-        .all()
-    )
-    relapse_events = (
-        db.query(Event)
-        .filter(Event.program_id == program.id, Event.event_type == "relapse", Event.occurred_at >= relapse_cutoff)
-        .all()
-    )
-
-    result = calculate_progress(program, recent_events, relapse_events, now)
-    return ProgressOut(**result)
+    unchanged = not_modified(request, response, program.user_id, program, day=now.date())
+    if unchanged is not None:
+        return unchanged
+
+    key = progress_cache_key("progress", program, now)
+    cached = progress_cache.get(key)
+    if cached is not None:
+        return cached
+
+    aggregates = load_progress_aggregates_from_rollup(db, program.id, now)
+    result = ProgressOut(**calculate_progress_from_aggregates(program, aggregates, now))
+    progress_cache.set(key, result)
+    return result
 
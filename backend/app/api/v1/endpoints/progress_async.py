@@ -0,0 +1,25 @@
+import uuid
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.dependencies import require_active_program
+from app.api.v1.endpoints import progress
+from app.db.replica import get_async_read_db
+from app.schemas.progress import ProgressOut
+from app.security.dependencies import get_current_user_id
+
+router = APIRouter()
+
+
+@router.get("", response_model=ProgressOut)
+async def get_progress(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_read_db),
+    user_id: uuid.UUID = Depends(get_current_user_id),
+):
+    return await db.run_sync(
+        lambda session: progress.get_progress(
+            request, response, db=session, program=require_active_program(session, user_id)
+        )
+    )
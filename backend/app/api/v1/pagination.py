@@ -0,0 +1,62 @@
+"""Keyset pagination helpers shared by the list endpoints.
+
+Pages stay JSON arrays; the cursor for the next page travels in the
+``X-Next-Cursor`` response header and is absent on the last page.
+Requests without a ``limit`` get every row, as before pagination existed,
+so callers that never follow the cursor keep seeing complete lists.
+"""
+
+import base64
+import json
+from typing import Callable, Sequence
+
+from fastapi import HTTPException, Response
+
+from app.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def page_size(limit: int | None) -> int | None:
+    """Requested page size, clamped to the server maximum; ``None`` when unpaginated."""
+    return None if limit is None else min(limit, settings.list_page_size_max)
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([value.isoformat() if hasattr(value, "isoformat") else str(value) for value in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parsers: Sequence[Callable[[str], object]]) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(parsers):
+            raise ValueError("cursor arity")
+        return tuple(parse(value) for parse, value in zip(parsers, values))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+
+def split_page(rows: list, limit: int, key: Callable[[object], Sequence]) -> tuple[list, str | None]:
+    """Trim the ``limit + 1`` probe row; the cursor for the next page is ``None`` on the last one."""
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(key(page[-1]))
+
+
+def paginate(rows: list, limit: int, response: Response, key: Callable[[object], Sequence]) -> list:
+    """Trim the ``limit + 1`` probe row and publish the next cursor, if any."""
+    page, next_cursor = split_page(rows, limit, key)
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return page
+
+
+def fetch_page(query, limit: int | None, response: Response, key: Callable[[object], Sequence]) -> list:
+    """Run an ordered query as one page of ``limit`` rows, or in full without a limit."""
+    size = page_size(limit)
+    if size is None:
+        return query.all()
+    return paginate(query.limit(size + 1).all(), size, response, key)
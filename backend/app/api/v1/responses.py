@@ -0,0 +1,80 @@
+"""orjson fast path for large list responses.
+
+Rows read straight from the database as ``Row`` tuples are already valid,
+so they skip ``response_model`` validation and go to orjson as-is. The
+route keeps its ``response_model`` for the OpenAPI schema.
+
+List endpoints can also answer in a columnar shape for charts: one array
+per field, timestamps as epoch seconds.
+"""
+
+import calendar
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Iterable, Sequence
+
+import orjson
+from fastapi import Request, Response
+
+COLUMNAR_MEDIA_TYPE = "application/vnd.quitotine.columnar+json"
+
+
+class ListFormat(str, Enum):
+    rows = "rows"
+    columnar = "columnar"
+
+
+def _default(value: Any):
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        # OPT_UTC_Z matches pydantic's "Z" suffix for UTC timestamps.
+        return orjson.dumps(content, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def rows_response(rows: Iterable, response: Response) -> FastJSONResponse:
+    """Serialize trusted rows, keeping headers already set on the injected ``response``."""
+    headers = dict(response.headers)
+    headers["Vary"] = "Accept"
+    return FastJSONResponse([row._asdict() for row in rows], headers=headers)
+
+
+def list_format(request: Request, format: ListFormat | None) -> ListFormat:
+    """``?format=`` wins; otherwise columnar is chosen by ``Accept``."""
+    if format is not None:
+        return format
+    if COLUMNAR_MEDIA_TYPE in request.headers.get("accept", ""):
+        return ListFormat.columnar
+    return ListFormat.rows
+
+
+def epoch_seconds(value: date | datetime) -> int:
+    """Whole UTC seconds; naive datetimes (SQLite) are taken as UTC and dates as UTC midnight."""
+    if isinstance(value, datetime):
+        return calendar.timegm(value.utctimetuple())
+    return calendar.timegm(value.timetuple())
+
+
+def columnar_response(
+    rows: Sequence,
+    fields: Sequence[str],
+    timestamps: Sequence[str],
+    response: Response,
+) -> FastJSONResponse:
+    """One array per field in ``fields``; ``timestamps`` fields become epoch seconds."""
+    body = {}
+    for name in fields:
+        values = [getattr(row, name) for row in rows]
+        if name in timestamps:
+            values = [epoch_seconds(value) for value in values]
+        body[name] = values
+    headers = dict(response.headers)
+    headers["Vary"] = "Accept"
+    return FastJSONResponse(body, headers=headers, media_type=COLUMNAR_MEDIA_TYPE)
@@ -1,14 +1,27 @@
 ﻿from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, profile, programs, events, progress, dashboard, diary
-
-api_router = APIRouter()
-
-api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
-api_router.include_router(profile.router, prefix="/me", tags=["me"])
-api_router.include_router(profile.router, prefix="/profile", tags=["profile"])
-api_router.include_router(programs.router, prefix="/programs", tags=["programs"])
-api_router.include_router(events.router, prefix="/events", tags=["events"])
-api_router.include_router(diary.router, prefix="/diary", tags=["diary"])
-api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
-api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+from app.api.v1.endpoints import auth, bootstrap, profile, programs, events, progress, dashboard, diary, insights, internal
+from app.api.v1.endpoints import events_async, progress_async, dashboard_async, diary_async
+
+
+def build_api_router(database_async: bool = False) -> APIRouter:
+    api_router = APIRouter()
+
+    api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+    api_router.include_router(profile.router, prefix="/me", tags=["me"])
+    api_router.include_router(profile.router, prefix="/profile", tags=["profile"])
+    api_router.include_router(programs.router, prefix="/programs", tags=["programs"])
+    if database_async:
+        api_router.include_router(events_async.router, prefix="/events", tags=["events"])
+        api_router.include_router(diary_async.router, prefix="/diary", tags=["diary"])
+        api_router.include_router(progress_async.router, prefix="/progress", tags=["progress"])
+        api_router.include_router(dashboard_async.router, prefix="/dashboard", tags=["dashboard"])
+    else:
+        api_router.include_router(events.router, prefix="/events", tags=["events"])
+        api_router.include_router(diary.router, prefix="/diary", tags=["diary"])
+        api_router.include_router(progress.router, prefix="/progress", tags=["progress"])
+        api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+    api_router.include_router(insights.router, prefix="/insights", tags=["insights"])
+    api_router.include_router(bootstrap.router, prefix="/bootstrap", tags=["bootstrap"])
+    api_router.include_router(internal.router, prefix="/internal", tags=["internal"], include_in_schema=False)
+    return api_router
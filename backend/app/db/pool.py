@@ -0,0 +1,163 @@
+import bisect
+import threading
+import time
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.config import settings
+
+# Upper bounds (milliseconds) of the checkout latency histogram buckets.
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_timeouts = 0
+            self.checkout_seconds_total = 0.0
+            self.checkout_seconds_max = 0.0
+            self.checkout_histogram = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+            self.pre_pings = 0
+            self.pre_ping_failures = 0
+
+    def record_checkout(self, seconds: float) -> None:
+        bucket = bisect.bisect_left(CHECKOUT_BUCKETS_MS, seconds * 1000)
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+            self.checkout_histogram[bucket] += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.checkout_timeouts += 1
+
+    def record_pre_ping(self, ok: bool) -> None:
+        with self._lock:
+            self.pre_pings += 1
+            if not ok:
+                self.pre_ping_failures += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            labels = [f"le_{bound}ms" for bound in CHECKOUT_BUCKETS_MS] + ["gt_5000ms"]
+            average = self.checkout_seconds_total / self.checkouts if self.checkouts else 0.0
+            return {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.checkout_timeouts,
+                "checkout_avg_ms": round(average * 1000, 3),
+                "checkout_max_ms": round(self.checkout_seconds_max * 1000, 3),
+                "checkout_histogram": dict(zip(labels, self.checkout_histogram)),
+                "pre_pings": self.pre_pings,
+                "pre_ping_failures": self.pre_ping_failures,
+            }
+
+
+class _InstrumentedPoolMixin:
+    stats: PoolStats | None = None
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.stats is not None:
+                self.stats.record_timeout()
+            raise
+        # Only successful checkouts feed the latency histogram; a timeout
+        # would otherwise show up as a ``pool_timeout``-long checkout.
+        if self.stats is not None:
+            self.stats.record_checkout(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_options(poolclass) -> dict:
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_use_lifo": settings.db_pool_use_lifo,
+        # Pre-ping is done by the checkout listener below so failures can be counted.
+        "pool_pre_ping": False,
+    }
+
+
+_registry: dict[str, tuple[object, PoolStats]] = {}
+
+
+def instrument_engine(name: str, engine) -> PoolStats:
+    """Attach stats and the configured pre-ping strategy to ``engine`` (sync or async)."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    stats = PoolStats()
+    sync_engine.pool.stats = stats
+    strategy = settings.db_pool_pre_ping
+    idle_seconds = settings.db_pool_pre_ping_idle_seconds
+
+    @event.listens_for(sync_engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(sync_engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if strategy == "never":
+            return
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None:
+            # Freshly opened connection, nothing to verify.
+            return
+        if strategy == "idle" and time.monotonic() - checked_in_at < idle_seconds:
+            return
+        dialect = sync_engine.dialect
+        try:
+            dialect.do_ping(dbapi_connection)
+        except dialect.loaded_dbapi.Error as error:
+            # Same test as SQLAlchemy's own pre-ping: only a dead connection is
+            # retried; any other error reaches the caller and is not counted.
+            if not dialect.is_disconnect(error, dbapi_connection, None):
+                raise
+            stats.record_pre_ping(ok=False)
+            # The pool invalidates this connection and retries with a fresh one.
+            raise exc.DisconnectionError(f"Pre-ping failed: {error}") from error
+        stats.record_pre_ping(ok=True)
+
+    _registry[name] = (sync_engine, stats)
+    return stats
+
+
+def pool_status() -> dict:
+    result = {}
+    for name, (sync_engine, stats) in _registry.items():
+        pool = sync_engine.pool
+        status = {"pool_class": type(pool).__name__}
+        if isinstance(pool, QueuePool):
+            status.update(
+                size=pool.size(),
+                checked_in=pool.checkedin(),
+                checked_out=pool.checkedout(),
+                overflow=max(pool.overflow(), 0),
+                max_overflow=settings.db_max_overflow,
+            )
+        status.update(stats.snapshot())
+        result[name] = status
+    return result
@@ -0,0 +1,97 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import session as db_session
+from app.db.session import get_async_db, get_db
+from app.models.models import Program
+from app.security.dependencies import get_current_user_id
+
+
+class RecentWrites:
+    """Bounded map of user id -> time of that user's last committed write on this worker."""
+
+    def __init__(self, max_entries: int = 10_000) -> None:
+        self._max_entries = max_entries
+        self._entries: OrderedDict[uuid.UUID, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def mark(self, user_id: uuid.UUID) -> None:
+        with self._lock:
+            self._entries[user_id] = time.monotonic()
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def is_recent(self, user_id: uuid.UUID, window_seconds: float) -> bool:
+        with self._lock:
+            written_at = self._entries.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < window_seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+recent_writes = RecentWrites()
+
+
+def mark_write(user_id: uuid.UUID) -> None:
+    recent_writes.mark(user_id)
+
+
+def stays_on_primary(db: Session, user_id: uuid.UUID) -> bool:
+    """Whether ``user_id`` wrote within ``replica_read_your_writes_seconds``.
+
+    Writes on this worker are answered from memory. Writes on any other
+    worker are found through ``programs.data_changed_at``, which every
+    program-data write stamps, with one indexed lookup on the primary ``db``.
+    """
+    window = settings.replica_read_your_writes_seconds
+    if recent_writes.is_recent(user_id, window):
+        return True
+    since = datetime.now(timezone.utc) - timedelta(seconds=window)
+    statement = select(Program.id).where(Program.user_id == user_id, Program.data_changed_at >= since).limit(1)
+    return db.execute(statement).first() is not None
+
+
+def get_read_db(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """Session for read-only handlers.
+
+    Uses the replica when one is configured, except for users who wrote within
+    ``replica_read_your_writes_seconds`` on any worker; they stay on the primary
+    so they never read their own writes stale.
+    """
+    if db_session.ReadSessionLocal is None or stays_on_primary(db, user_id):
+        yield db
+        return
+
+    replica = db_session.ReadSessionLocal()
+    try:
+        yield replica
+    finally:
+        replica.close()
+
+
+async def get_async_read_db(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """``get_read_db`` for the async handlers, routed by the same rule."""
+    if db_session.AsyncReadSessionLocal is None or await db.run_sync(stays_on_primary, user_id):
+        yield db
+        return
+
+    async with db_session.AsyncReadSessionLocal() as replica:
+        yield replica
@@ -1,18 +1,71 @@
 ﻿from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from app.config import settings
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument_engine, pool_options
 
 Base = declarative_base()
 
 
 def get_engine():
-    return create_engine(settings.database_url, pool_pre_ping=True)
+    engine = create_engine(settings.database_url, **pool_options(InstrumentedQueuePool))
+    instrument_engine("primary", engine)
+    return engine
+
+
+def get_replica_engine():
+    engine = create_engine(settings.database_replica_url, **pool_options(InstrumentedQueuePool))
+    instrument_engine("replica", engine)
+    return engine
+
+
+def get_async_database_url() -> str:
+    if settings.async_database_url:
+        return settings.async_database_url
+    return settings.database_url.replace("+psycopg2", "+asyncpg")
+
+
+def get_async_engine():
+    engine = create_async_engine(get_async_database_url(), **pool_options(InstrumentedAsyncQueuePool))
+    instrument_engine("primary_async", engine)
+    return engine
+
+
+def get_async_replica_url() -> str:
+    if settings.async_database_replica_url:
+        return settings.async_database_replica_url
+    return settings.database_replica_url.replace("+psycopg2", "+asyncpg")
+
+
+def get_async_replica_engine():
+    engine = create_async_engine(get_async_replica_url(), **pool_options(InstrumentedAsyncQueuePool))
+    instrument_engine("replica_async", engine)
+    return engine
 
 
 engine = get_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Without a replica URL every read goes to the primary (see app.db.replica).
+replica_engine = get_replica_engine() if settings.database_replica_url else None
+ReadSessionLocal = (
+    sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine is not None else None
+)
+
+# The async engine is only built when enabled so the sync deployment does not
+# need the asyncpg driver installed.
+async_engine = get_async_engine() if settings.database_async else None
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+async_replica_engine = (
+    get_async_replica_engine() if settings.database_async and settings.database_replica_url else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(bind=async_replica_engine, autoflush=False, expire_on_commit=False)
+    if async_replica_engine is not None
+    else None
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -20,3 +73,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,4 +1,6 @@
 import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
@@ -6,7 +8,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from app.config import settings
-from app.api.v1.router import api_router
+from app.api.v1.router import build_api_router
+from app.security.passwords import shutdown_password_pool
+from app.security.rate_limit import RateLimitMiddleware
+
+logger = logging.getLogger(__name__)
 
 
 def setup_logging() -> None:
@@ -16,13 +22,24 @@ def setup_logging() -> None:
     )
 
 
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # Join the hashing processes so a reload does not leave them behind.
+    shutdown_password_pool(wait=True)
+
+
 def create_app() -> FastAPI:
     setup_logging()
-    app = FastAPI(title=settings.app_name)
+    app = FastAPI(title=settings.app_name, lifespan=lifespan)
 
     @app.exception_handler(StarletteHTTPException)
     async def http_exception_handler(_: Request, exc: StarletteHTTPException):
-        return JSONResponse(status_code=exc.status_code, content={"error": str(exc.detail)})
+        return JSONResponse(
+            status_code=exc.status_code,
+            content={"error": str(exc.detail)},
+            headers=getattr(exc, "headers", None),
+        )
 
     @app.exception_handler(RequestValidationError)
     async def validation_exception_handler(_: Request, exc: RequestValidationError):
@@ -43,18 +60,25 @@ def create_app() -> FastAPI:
     async def unhandled_exception_handler(_: Request, exc: Exception):
         return JSONResponse(status_code=500, content={"error": f"Internal server error: {exc}"})
 
+    # Added before CORS so that 429 responses still carry CORS headers.
+    if settings.rate_limit_enabled:
+        app.add_middleware(RateLimitMiddleware)
+        if settings.rate_limit_trusted_proxies == 0 and settings.environment.strip().lower() not in {"test", "development"}:
+            logger.warning(
+                "RATE_LIMIT_TRUSTED_PROXIES is 0: clients are keyed by the socket peer, so behind a load balancer "
+                "every request shares one per-IP bucket"
+            )
+
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.cors_origins,
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["ETag", "Last-Modified", "X-Next-Cursor"],
     )
 
-    # Rate limiting placeholder: wire in a limiter here later
-    # e.g., SlowAPI / Redis or API Gateway rules.
-
-    app.include_router(api_router, prefix=settings.api_prefix)
+    app.include_router(build_api_router(settings.database_async), prefix=settings.api_prefix)
     return app
 
 
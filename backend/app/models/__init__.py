@@ -1,11 +1,13 @@
 from app.models.models import (
     DiaryEntry,
     Event,
+    EventDailyStat,
     EventType,
     GoalType,
     ProductProfile,
     ProductType,
     Program,
+    ProgressSnapshot,
     RefreshToken,
     TriggerType,
     User,
@@ -17,6 +19,8 @@ __all__ = [
     "ProductProfile",
     "Event",
     "DiaryEntry",
+    "EventDailyStat",
+    "ProgressSnapshot",
     "RefreshToken",
     "ProductType",
     "GoalType",
@@ -0,0 +1,3 @@
+from app.models.models import EventDailyStat
+
+__all__ = ["EventDailyStat"]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import date, datetime
 
-from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Integer, Numeric, String, Uuid, UniqueConstraint, func
+from sqlalchemy import Boolean, Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Uuid, UniqueConstraint, func, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.session import Base
@@ -16,6 +16,7 @@ class User(Base):
     password_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     display_name: Mapped[str | None] = mapped_column(String(100), nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    deletion_requested_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -25,6 +26,14 @@ class User(Base):
 
 class Program(Base):
     __tablename__ = "programs"
+    __table_args__ = (
+        Index(
+            "ix_programs_user_active",
+            "user_id",
+            postgresql_where=text("is_active IS TRUE"),
+            sqlite_where=text("is_active IS 1"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("users.id"), index=True)
@@ -32,6 +41,9 @@ class Program(Base):
     started_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     ended_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    # Bumped by every write that changes what the program's read endpoints return.
+    data_version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    data_changed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -39,6 +51,8 @@ class Program(Base):
     product_profile = relationship("ProductProfile", back_populates="program", uselist=False, cascade="all, delete-orphan")
     events = relationship("Event", back_populates="program", cascade="all, delete-orphan")
     diary_entries = relationship("DiaryEntry", back_populates="program", cascade="all, delete-orphan")
+    daily_stats = relationship("EventDailyStat", back_populates="program", cascade="all, delete-orphan")
+    progress_snapshots = relationship("ProgressSnapshot", back_populates="program", cascade="all, delete-orphan")
 
 
 class ProductProfile(Base):
@@ -59,9 +73,24 @@ class ProductProfile(Base):
 
 class Event(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        Index(
+            "ix_events_program_type_occurred",
+            "program_id",
+            "event_type",
+            "occurred_at",
+            postgresql_include=["amount", "intensity"],
+        ),
+        Index(
+            "ix_events_program_occurred",
+            "program_id",
+            "occurred_at",
+            postgresql_include=["event_type", "amount"],
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    program_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("programs.id"), index=True)
+    program_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("programs.id"))
     event_type: Mapped[str] = mapped_column(String(20), nullable=False, default=EventType.use.value)
     amount: Mapped[float | None] = mapped_column(Numeric(10, 2), nullable=True)
     intensity: Mapped[int | None] = mapped_column(Integer, nullable=True)
@@ -73,6 +102,51 @@ class Event(Base):
     program = relationship("Program", back_populates="events")
 
 
+class EventDailyStat(Base):
+    """Per-program, per-UTC-day rollup of events, maintained alongside event writes."""
+
+    __tablename__ = "event_daily_stats"
+
+    program_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("programs.id"), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    use_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    use_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    relapse_amount: Mapped[float] = mapped_column(Numeric(12, 2), nullable=False, default=0)
+    relapse_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    craving_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    craving_intensity_sum: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    craving_intensity_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    craving_intensity_max: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    trigger_stress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_social: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_alcohol: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_boredom: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_morning: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_after_meal: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    trigger_other: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    program = relationship("Program", back_populates="daily_stats")
+
+
+class ProgressSnapshot(Base):
+    """Nightly batch copy of ``calculate_progress`` for one program and UTC day."""
+
+    __tablename__ = "progress_snapshots"
+
+    program_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("programs.id"), primary_key=True)
+    snapshot_date: Mapped[date] = mapped_column(Date, primary_key=True, index=True)
+    progress_percent: Mapped[float] = mapped_column(Numeric(5, 2), nullable=False)
+    days_since_start: Mapped[int] = mapped_column(Integer, nullable=False)
+    baseline_daily_amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    recent_average_daily_amount: Mapped[float] = mapped_column(Numeric(10, 2), nullable=False)
+    reduction_progress: Mapped[float] = mapped_column(Numeric(6, 4), nullable=False)
+    relapse_penalty: Mapped[float] = mapped_column(Numeric(6, 4), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+    program = relationship("Program", back_populates="progress_snapshots")
+
+
 class DiaryEntry(Base):
     __tablename__ = "diary_entries"
     __table_args__ = (UniqueConstraint("program_id", "entry_date", name="uq_diary_program_date"),)
@@ -89,6 +163,16 @@ class DiaryEntry(Base):
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        # Both serve the purge job (app/services/refresh_tokens.py).
+        Index("ix_refresh_tokens_expires_at", "expires_at"),
+        Index(
+            "ix_refresh_tokens_revoked_at",
+            "revoked_at",
+            postgresql_where=text("revoked_at IS NOT NULL"),
+            sqlite_where=text("revoked_at IS NOT NULL"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id: Mapped[uuid.UUID] = mapped_column(Uuid(as_uuid=True), ForeignKey("users.id"), index=True)
@@ -106,6 +190,8 @@ __all__ = [
     "ProductProfile",
     "Event",
     "DiaryEntry",
+    "EventDailyStat",
+    "ProgressSnapshot",
     "RefreshToken",
     "ProductType",
     "GoalType",
@@ -0,0 +1,3 @@
+from app.models.models import ProgressSnapshot
+
+__all__ = ["ProgressSnapshot"]
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+from app.schemas.diary import DiaryEntryOut
+from app.schemas.event import EventOut
+from app.schemas.program import ProgramOut
+from app.schemas.progress import DashboardOut
+from app.schemas.user import UserOut
+
+
+class BootstrapOut(BaseModel):
+    user: UserOut
+    active_program: ProgramOut | None
+    dashboard: DashboardOut | None
+    diary: list[DiaryEntryOut]
+    cravings: list[EventOut]
+    # Set when a list was cut at the page size; pass it as ``cursor`` to
+    # ``GET /diary`` or ``GET /events?event_type=craving`` for the rest.
+    diary_next_cursor: str | None = None
+    cravings_next_cursor: str | None = None
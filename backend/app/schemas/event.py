@@ -1,7 +1,7 @@
 ﻿from datetime import datetime
 from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, model_validator
 
 from app.models.enums import EventType, TriggerType
 
@@ -31,3 +31,17 @@ class EventOut(BaseModel):
     trigger: TriggerType | None
     notes: str | None
     occurred_at: datetime
+
+
+# One adapter validates a whole batch; error locations start with the item index.
+EventCreateList = TypeAdapter(list[EventCreate])
+
+
+class EventBatchItemError(BaseModel):
+    index: int
+    errors: list[str]
+
+
+class EventBatchOut(BaseModel):
+    created: list[EventOut]
+    errors: list[EventBatchItemError]
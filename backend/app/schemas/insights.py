@@ -0,0 +1,15 @@
+from datetime import date
+
+from pydantic import BaseModel
+
+
+class DailyInsightsOut(BaseModel):
+    """Column arrays with one element per day; element ``i`` is ``start + i`` days."""
+
+    start: date
+    end: date
+    mood: list[int | None]
+    craving_count: list[int]
+    craving_intensity_avg: list[float | None]
+    craving_intensity_max: list[int | None]
+    use_amount: list[float]
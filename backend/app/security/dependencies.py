@@ -1,27 +1,85 @@
 import uuid
+from dataclasses import dataclass
+
 from fastapi import Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.config import settings
+from app.db.session import get_async_db, get_db
 from app.models.models import User
 from app.security.jwt import decode_token
+from app.services.cache import TTLCache
 
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-) -> User:
-    token = credentials.credentials
-    decoded = decode_token(token)
+@dataclass(frozen=True)
+class Principal:
+    """Detached snapshot of the authenticated user, safe to share across requests."""
+
+    id: uuid.UUID
+    email: str
+    display_name: str | None
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(id=user.id, email=user.email, display_name=user.display_name, is_active=user.is_active)
+
+
+principal_cache = TTLCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+)
+
+
+def invalidate_principal(user_id: uuid.UUID) -> None:
+    principal_cache.pop(user_id)
+
+
+def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> uuid.UUID:
+    """Claims-only authentication: trusts the signed access token and skips the users table."""
+    decoded = decode_token(credentials.credentials)
     if decoded.get("type") != "access":
         raise HTTPException(status_code=401, detail="Invalid token")
+    return uuid.UUID(decoded.get("sub"))
+
+
+def get_current_principal(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> Principal:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user or not user.is_active:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    principal = Principal.from_user(user)
+    principal_cache.set(user_id, principal)
+    return principal
+
 
-    user_id = uuid.UUID(decoded.get("sub"))
+def get_current_user(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+) -> User:
+    """Loads the ORM user; only for handlers that modify the user row."""
     user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="Invalid token")
     return user
 
+
+async def get_current_user_async(
+    user_id: uuid.UUID = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user = (await db.execute(select(User).where(User.id == user_id))).scalar_one_or_none()
+    if not user or not user.is_active:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user
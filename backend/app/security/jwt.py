@@ -1,9 +1,23 @@
 ﻿from datetime import datetime, timedelta, timezone
+import hashlib
+import time
 import uuid
 from jose import jwt, JWTError
 from fastapi import HTTPException
 
 from app.config import settings
+from app.services.cache import TTLCache
+
+# Verified access-token claims keyed by a digest of the whole token, so a
+# token with any byte changed misses and goes through full verification.
+verified_token_cache = TTLCache(
+    max_entries=settings.token_cache_max_entries,
+    ttl_seconds=settings.token_cache_ttl_seconds,
+)
+
+
+def _now() -> float:
+    return time.time()
 
 
 def create_access_token(user_id: str) -> str:
@@ -21,7 +35,22 @@ def create_refresh_token(user_id: str) -> tuple[str, str]:
 
 
 def decode_token(token: str) -> dict:
+    key = hashlib.sha256(token.encode()).digest()
+    now = _now()
+    claims = verified_token_cache.get(key)
+    if claims is not None:
+        if claims["exp"] <= now:
+            verified_token_cache.pop(key)
+            raise HTTPException(status_code=401, detail="Invalid token")
+        return dict(claims)
+
     try:
-        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+        claims = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
+
+    # Refresh tokens are single-use, so only access tokens are worth keeping.
+    exp = claims.get("exp")
+    if claims.get("type") == "access" and isinstance(exp, (int, float)) and exp > now:
+        verified_token_cache.set(key, dict(claims), ttl_seconds=min(settings.token_cache_ttl_seconds, exp - now))
+    return claims
@@ -1,18 +1,117 @@
-﻿import re
+﻿"""Password hashing on a dedicated, bounded process pool.
+
+Argon2 is deliberately slow. Hashing runs on ``password_hash_workers``
+processes so a burst of logins cannot take over every CPU core; at most
+``password_hash_max_queue`` further requests may wait, anything beyond
+that gets a ``503`` straight away. The helpers are coroutines, so waiting
+requests sit on the event loop instead of holding threadpool threads.
+"""
+
+import asyncio
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, TypeVar
+
 from passlib.context import CryptContext
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+
+T = TypeVar("T")
+
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=settings.argon2_time_cost,
+    argon2__memory_cost=settings.argon2_memory_cost,
+    argon2__parallelism=settings.argon2_parallelism,
+)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(max(settings.password_hash_workers, 1) + settings.password_hash_max_queue)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that is already running request threads is unsafe.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+
+def shutdown_password_pool(wait: bool = False) -> None:
+    """Discard the pool; with ``wait`` the worker processes are joined (app shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=True)
 
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-in requests in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
 
-def hash_password(password: str) -> str:
+
+async def _run(fn: Callable[..., T], *args) -> T:
+    if settings.password_hash_workers <= 0:
+        return await run_in_threadpool(fn, *args)
+    if not _slots.acquire(blocking=False):
+        raise _busy()
+    try:
+        future = _get_pool().submit(fn, *args)
+    except Exception as exc:
+        _slots.release()
+        if isinstance(exc, BrokenProcessPool):
+            shutdown_password_pool()
+            raise _busy() from None
+        raise
+    # Released when the worker is done, even if the request is cancelled first.
+    future.add_done_callback(lambda _: _slots.release())
+    try:
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        shutdown_password_pool()
+        raise _busy() from None
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(password: str, password_hash: str) -> bool:
+def _verify(password: str, password_hash: str) -> bool:
     return pwd_context.verify(password, password_hash)
 
 
+def _verify_and_update(password: str, password_hash: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(password, password_hash)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(_hash, password)
+
+
+async def verify_password(password: str, password_hash: str) -> bool:
+    return await _run(_verify, password, password_hash)
+
+
+async def verify_and_update_password(password: str, password_hash: str) -> tuple[bool, str | None]:
+    """Verify, and rehash in the same worker call if ``password_hash`` uses outdated parameters."""
+    return await _run(_verify_and_update, password, password_hash)
+
+
 def validate_password_strength(password: str) -> None:
     if len(password) < 8:
         raise HTTPException(status_code=400, detail="Password too short")
@@ -0,0 +1,313 @@
+"""Token-bucket rate limiting as a pure ASGI middleware.
+
+Rules are matched on method and path before the request reaches FastAPI,
+so a rejected login costs a dictionary lookup (or one Redis round trip)
+instead of an Argon2 hash. Each rule can limit per client IP and per
+account; the account is the email in the JSON body for auth routes and
+the access token subject for authenticated writes.
+
+The in-process backend keeps buckets per worker. The Redis backend keeps
+them in a shared store (Redis or any server speaking its protocol and
+Lua scripting) so limits hold across workers.
+"""
+
+import hashlib
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Protocol, Sequence
+
+import orjson
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import settings
+from app.security.jwt import decode_token
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+MAX_ACCOUNT_BODY_BYTES = 16 * 1024
+
+
+@dataclass(frozen=True)
+class Limit:
+    burst: int
+    per_minute: float
+
+    @property
+    def refill_per_second(self) -> float:
+        return self.per_minute / 60.0
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """``path`` matches exactly, or as a prefix when it ends with ``/``.
+
+    ``account`` is ``"email"`` (JSON body field) or ``"token"`` (bearer
+    token subject). The first matching rule applies.
+    """
+
+    name: str
+    methods: frozenset[str]
+    path: str
+    per_ip: Limit | None = None
+    per_account: Limit | None = None
+    account: str = "token"
+
+    def matches(self, method: str, path: str) -> bool:
+        if method not in self.methods:
+            return False
+        if self.path.endswith("/"):
+            return path.startswith(self.path)
+        return path == self.path
+
+
+def default_rules(prefix: str | None = None) -> list[RateLimitRule]:
+    prefix = settings.api_prefix if prefix is None else prefix
+    auth_ip = Limit(settings.rate_limit_auth_ip_burst, settings.rate_limit_auth_ip_per_minute)
+    auth_account = Limit(settings.rate_limit_auth_account_burst, settings.rate_limit_auth_account_per_minute)
+    write = Limit(settings.rate_limit_write_burst, settings.rate_limit_write_per_minute)
+    post = frozenset({"POST"})
+    return [
+        RateLimitRule("login", post, f"{prefix}/auth/login", auth_ip, auth_account, account="email"),
+        RateLimitRule("register", post, f"{prefix}/auth/register", auth_ip, auth_account, account="email"),
+        RateLimitRule("refresh", post, f"{prefix}/auth/refresh", per_ip=auth_ip),
+        RateLimitRule("write", WRITE_METHODS, f"{prefix}/", per_account=write),
+    ]
+
+
+class RateLimitBackend(Protocol):
+    async def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        """Take one token; return ``(allowed, seconds until a token is available)``."""
+
+
+def _refill(tokens: float, updated: float, now: float, limit: Limit) -> float:
+    return min(float(limit.burst), tokens + max(now - updated, 0.0) * limit.refill_per_second)
+
+
+class MemoryRateLimitBackend:
+    """Buckets in this process; least recently used keys are dropped past ``max_entries``.
+
+    Only touched from the event loop, so no lock is needed.
+    """
+
+    def __init__(self, max_entries: int = 100_000) -> None:
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        now = time.monotonic()
+        state = self._buckets.get(key)
+        tokens = float(limit.burst) if state is None else _refill(*state, now, limit)
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (1.0 - tokens) / limit.refill_per_second
+
+
+# Refill and take atomically. Numbers go back as strings because Redis
+# truncates Lua numbers to integers.
+TOKEN_BUCKET_SCRIPT = """
+local burst = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1])
+local updated = tonumber(state[2])
+if tokens == nil then
+  tokens = burst
+else
+  tokens = math.min(burst, tokens + math.max(now - updated, 0) * rate)
+end
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  allowed = 1
+  tokens = tokens - 1
+else
+  retry_after = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisRateLimitBackend:
+    """Buckets in a shared Redis-compatible store.
+
+    If the store is unreachable the ``fallback`` backend answers, so limits
+    degrade to per-worker instead of failing every request.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:", fallback: RateLimitBackend | None = None) -> None:
+        self.prefix = prefix
+        self.fallback = fallback or MemoryRateLimitBackend()
+        self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str) -> "RedisRateLimitBackend":
+        from redis.asyncio import Redis
+
+        return cls(Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5))
+
+    async def take(self, key: str, limit: Limit) -> tuple[bool, float]:
+        from redis.exceptions import RedisError
+
+        try:
+            allowed, retry_after = await self._script(
+                keys=[self.prefix + key],
+                args=[limit.burst, limit.refill_per_second, time.time()],
+            )
+        except (RedisError, OSError) as exc:
+            logger.warning("Rate limit store unavailable, using in-process buckets: %s", exc)
+            return await self.fallback.take(key, limit)
+        return bool(int(allowed)), float(retry_after)
+
+
+def build_backend() -> RateLimitBackend:
+    if settings.rate_limit_backend == "redis":
+        if not settings.rate_limit_redis_url:
+            raise RuntimeError("RATE_LIMIT_REDIS_URL is required when RATE_LIMIT_BACKEND=redis")
+        return RedisRateLimitBackend.from_url(settings.rate_limit_redis_url)
+    return MemoryRateLimitBackend()
+
+
+def _digest(value: str) -> str:
+    # Shared stores only ever see a digest of the email or user id.
+    return hashlib.sha256(value.encode()).hexdigest()[:32]
+
+
+class RateLimitMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        rules: Sequence[RateLimitRule] | None = None,
+        backend: RateLimitBackend | None = None,
+        trusted_proxies: int | None = None,
+    ) -> None:
+        self.app = app
+        self.rules = list(default_rules() if rules is None else rules)
+        self.backend = backend or build_backend()
+        self.trusted_proxies = settings.rate_limit_trusted_proxies if trusted_proxies is None else trusted_proxies
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method, path = scope["method"], scope["path"]
+        rule = next((rule for rule in self.rules if rule.matches(method, path)), None)
+        if rule is None:
+            await self.app(scope, receive, send)
+            return
+
+        buckets = []
+        if rule.per_ip:
+            buckets.append((f"{rule.name}:ip:{self._client_ip(scope)}", rule.per_ip))
+        if rule.per_account:
+            account, receive = await self._account(rule, scope, receive)
+            if account:
+                buckets.append((f"{rule.name}:account:{_digest(account)}", rule.per_account))
+
+        for key, limit in buckets:
+            allowed, retry_after = await self.backend.take(key, limit)
+            if not allowed:
+                response = JSONResponse(
+                    status_code=429,
+                    content={"error": "Too many requests"},
+                    headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+    def _client_ip(self, scope: Scope) -> str:
+        """Address seen by the outermost of ``trusted_proxies`` proxies in front of the app.
+
+        Each proxy appends the address it received the request from, so only
+        the rightmost ``trusted_proxies`` entries of ``X-Forwarded-For`` are
+        trustworthy; anything to their left was supplied by the client.
+        """
+        if self.trusted_proxies > 0:
+            hops = [
+                hop.strip()
+                for name, value in scope["headers"]
+                if name == b"x-forwarded-for"
+                for hop in value.decode("latin-1").split(",")
+                if hop.strip()
+            ]
+            if len(hops) >= self.trusted_proxies:
+                return hops[-self.trusted_proxies]
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    async def _account(self, rule: RateLimitRule, scope: Scope, receive: Receive) -> tuple[str | None, Receive]:
+        if rule.account == "email":
+            return await _email_from_body(receive)
+        return _token_subject(scope), receive
+
+
+def _token_subject(scope: Scope) -> str | None:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer" or not token:
+                return None
+            try:
+                return decode_token(token).get("sub")
+            except HTTPException:
+                return None
+    return None
+
+
+async def _email_from_body(receive: Receive) -> tuple[str | None, Receive]:
+    """Read the request body for its ``email`` and hand back a ``receive`` that replays it.
+
+    Reading stops past ``MAX_ACCOUNT_BODY_BYTES``; the rest of the body then
+    streams straight to the app and the request is limited by IP only.
+    """
+    chunks: list[bytes] = []
+    size = 0
+    more_body = True
+    while more_body and size <= MAX_ACCOUNT_BODY_BYTES:
+        message = await receive()
+        if message["type"] != "http.request":
+            # Client went away; let the app see the disconnect.
+            async def disconnected() -> Message:
+                return message
+
+            return None, disconnected
+        chunk = message.get("body", b"")
+        chunks.append(chunk)
+        size += len(chunk)
+        more_body = message.get("more_body", False)
+
+    body = b"".join(chunks)
+    replayed = False
+
+    async def replay() -> Message:
+        nonlocal replayed
+        if replayed:
+            return await receive()
+        replayed = True
+        return {"type": "http.request", "body": body, "more_body": more_body}
+
+    if more_body or size > MAX_ACCOUNT_BODY_BYTES:
+        return None, replay
+
+    email = None
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        payload = None
+    if isinstance(payload, dict) and isinstance(payload.get("email"), str):
+        email = payload["email"].strip().lower() or None
+    return email, replay
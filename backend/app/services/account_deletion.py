@@ -0,0 +1,128 @@
+"""Account deletion with set-based DELETEs instead of ORM cascades.
+
+``db.delete(user)`` loads every program, event and diary entry to delete
+them one by one. Here each table is cleared with one statement over the
+user's program ids. Accounts with more than
+``account_delete_background_threshold`` events are deactivated right away
+and purged by a background job in ``account_delete_batch_size`` chunks.
+``users.deletion_requested_at`` marks them until the purge finishes, so a
+deactivation for any other reason is never mistaken for a pending purge.
+"""
+
+import logging
+import uuid
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.models import (
+    DiaryEntry,
+    Event,
+    EventDailyStat,
+    ProductProfile,
+    Program,
+    ProgressSnapshot,
+    RefreshToken,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+PROGRAM_TABLES = (
+    ("events", Event),
+    ("diary_entries", DiaryEntry),
+    ("event_daily_stats", EventDailyStat),
+    ("progress_snapshots", ProgressSnapshot),
+    ("product_profiles", ProductProfile),
+)
+CHUNKED_TABLES = (("events", Event), ("diary_entries", DiaryEntry))
+
+
+def _program_ids(user_id: uuid.UUID):
+    return select(Program.id).where(Program.user_id == user_id)
+
+
+def _delete(db: Session, statement) -> int:
+    return db.execute(statement, execution_options={"synchronize_session": False}).rowcount or 0
+
+
+def is_large_account(db: Session, user_id: uuid.UUID, threshold: int | None = None) -> bool:
+    """Whether the user has more than ``threshold`` events; reads at most ``threshold + 1`` index entries."""
+    threshold = settings.account_delete_background_threshold if threshold is None else threshold
+    probe = select(Event.id).where(Event.program_id.in_(_program_ids(user_id))).limit(threshold + 1).subquery()
+    return db.execute(select(func.count()).select_from(probe)).scalar_one() > threshold
+
+
+def delete_account(db: Session, user_id: uuid.UUID) -> dict[str, int]:
+    """Delete the user and everything they own; runs in the caller's transaction.
+
+    Returns the number of rows removed per table.
+    """
+    programs = _program_ids(user_id)
+    counts = {name: _delete(db, delete(model).where(model.program_id.in_(programs))) for name, model in PROGRAM_TABLES}
+    counts["programs"] = _delete(db, delete(Program).where(Program.user_id == user_id))
+    counts["refresh_tokens"] = _delete(db, delete(RefreshToken).where(RefreshToken.user_id == user_id))
+    counts["users"] = _delete(db, delete(User).where(User.id == user_id))
+    return counts
+
+
+def deactivate_account(db: Session, user_id: uuid.UUID) -> None:
+    """End every session, hide the account and mark it for purging; the caller commits.
+
+    Inactive users cannot log in or resolve a principal, and without an
+    active program no events or diary entries can be added meanwhile.
+    """
+    _delete(db, delete(RefreshToken).where(RefreshToken.user_id == user_id))
+    db.execute(update(Program).where(Program.user_id == user_id).values(is_active=False))
+    db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(is_active=False, deletion_requested_at=datetime.now(timezone.utc))
+    )
+
+
+def purge_account_in_chunks(
+    session_factory: Callable[[], Session],
+    user_id: uuid.UUID,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """Background deletion for large accounts.
+
+    Events and diary entries go ``batch_size`` rows per transaction so no
+    single statement holds locks for long; ``delete_account`` then removes
+    the small remainder. Safe to rerun after an interruption.
+    """
+    batch_size = settings.account_delete_batch_size if batch_size is None else batch_size
+    db = session_factory()
+    try:
+        counts = {}
+        for name, model in CHUNKED_TABLES:
+            counts[name] = 0
+            while True:
+                chunk = select(model.id).where(model.program_id.in_(_program_ids(user_id))).limit(batch_size)
+                deleted = _delete(db, delete(model).where(model.id.in_(chunk)))
+                db.commit()
+                counts[name] += deleted
+                if deleted < batch_size:
+                    break
+
+        for name, deleted in delete_account(db, user_id).items():
+            counts[name] = counts.get(name, 0) + deleted
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Purging account %s failed; rerun scripts/purge_deleted_accounts.py", user_id)
+        raise
+    finally:
+        db.close()
+
+    logger.info("Purged account %s: %s", user_id, counts)
+    return counts
+
+
+def pending_account_ids(db: Session) -> list[uuid.UUID]:
+    """Accounts whose deletion was requested but whose purge has not finished."""
+    return list(db.execute(select(User.id).where(User.deletion_requested_at.is_not(None))).scalars())
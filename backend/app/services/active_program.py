@@ -0,0 +1,145 @@
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session, joinedload
+
+from app.config import settings
+from app.models.models import ProductProfile, Program
+from app.services.cache import TTLCache
+
+
+@dataclass(frozen=True)
+class ProductProfileSnapshot:
+    id: uuid.UUID
+    product_type: str
+    baseline_amount: float
+    unit_label: str
+    strength_mg: float | None
+    cost_per_unit: float | None
+
+    @classmethod
+    def from_profile(cls, profile: ProductProfile) -> "ProductProfileSnapshot":
+        return cls(
+            id=profile.id,
+            product_type=profile.product_type,
+            baseline_amount=profile.baseline_amount,
+            unit_label=profile.unit_label,
+            strength_mg=profile.strength_mg,
+            cost_per_unit=profile.cost_per_unit,
+        )
+
+
+@dataclass(frozen=True)
+class ActiveProgram:
+    """Detached copy of a user's active program and its product profile.
+
+    Attribute names mirror ``Program`` so it can be passed to
+    ``calculate_progress`` and serialized as ``ProgramOut``.
+    """
+
+    id: uuid.UUID
+    user_id: uuid.UUID
+    goal_type: str
+    started_at: datetime
+    is_active: bool
+    ended_at: datetime | None
+    product_profile: ProductProfileSnapshot | None
+    data_version: int = 0
+    data_changed_at: datetime | None = None
+
+    @classmethod
+    def from_program(cls, program: Program) -> "ActiveProgram":
+        profile = program.product_profile
+        return cls(
+            id=program.id,
+            user_id=program.user_id,
+            goal_type=program.goal_type,
+            started_at=program.started_at,
+            is_active=program.is_active,
+            ended_at=program.ended_at,
+            product_profile=ProductProfileSnapshot.from_profile(profile) if profile else None,
+            data_version=program.data_version,
+            data_changed_at=program.data_changed_at,
+        )
+
+
+active_program_cache = TTLCache(
+    max_entries=settings.active_program_cache_max_entries,
+    ttl_seconds=settings.active_program_cache_ttl_seconds,
+)
+
+_MEMO_KEY = "active_programs"
+
+
+def load_active_program_row(db: Session, user_id: uuid.UUID) -> Program | None:
+    """Active ``Program`` ORM row with its product profile loaded in the same query."""
+    statement = (
+        select(Program)
+        .options(joinedload(Program.product_profile))
+        .where(Program.user_id == user_id, Program.is_active.is_(True))
+    )
+    return db.execute(statement).scalars().first()
+
+
+def cached_active_program(db: Session, user_id: uuid.UUID) -> ActiveProgram | None:
+    """The cross-request cached copy, if the program's data version is unchanged.
+
+    The cache is per worker and writes only invalidate it on the worker that
+    handled them, so every hit is checked against ``programs.data_version``
+    with a primary key lookup. ETags and result cache keys built from the
+    returned copy therefore change as soon as any worker commits a write.
+    """
+    program = active_program_cache.get(user_id)
+    if program is None:
+        return None
+    version = db.execute(
+        select(Program.data_version).where(Program.id == program.id, Program.is_active.is_(True))
+    ).scalar()
+    if version != program.data_version:
+        active_program_cache.pop(user_id)
+        return None
+    return program
+
+
+def load_active_program(db: Session, user_id: uuid.UUID, use_cache: bool = True) -> ActiveProgram | None:
+    """Resolve the user's active program, memoized on the session for the request.
+
+    With ``use_cache`` the cross-request cache is consulted first; write paths
+    pass ``use_cache=False`` to always read the primary and refresh the cache.
+    """
+    memo = db.info.setdefault(_MEMO_KEY, {})
+    if user_id in memo:
+        return memo[user_id]
+
+    program = cached_active_program(db, user_id) if use_cache else None
+    if program is None:
+        row = load_active_program_row(db, user_id)
+        program = ActiveProgram.from_program(row) if row else None
+        if program is not None:
+            active_program_cache.set(user_id, program)
+        else:
+            active_program_cache.pop(user_id)
+
+    memo[user_id] = program
+    return program
+
+
+def invalidate_active_program(db: Session, user_id: uuid.UUID) -> None:
+    active_program_cache.pop(user_id)
+    db.info.get(_MEMO_KEY, {}).pop(user_id, None)
+
+
+def bump_data_version(db: Session, program_id: uuid.UUID) -> None:
+    """Mark the program's data as changed; runs in the caller's write transaction.
+
+    Call ``invalidate_active_program`` after the commit so this worker drops
+    its cached copy; other workers notice the new version on their next
+    ``cached_active_program`` check.
+    """
+    db.execute(
+        update(Program)
+        .where(Program.id == program_id)
+        .values(data_version=Program.data_version + 1, data_changed_at=datetime.now(timezone.utc))
+    )
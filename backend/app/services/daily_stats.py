@@ -0,0 +1,226 @@
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable
+
+from sqlalchemy import Date, DateTime, bindparam, case, cast, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models.enums import EventType, TriggerType
+from app.models.models import Event, EventDailyStat
+from app.services.progress import RECENT_DAYS, RELAPSE_DAYS, ProgressAggregates, _days_ago
+
+TRIGGER_COLUMNS = {trigger.value: f"trigger_{trigger.value}" for trigger in TriggerType}
+
+# Columns combined by addition when a day receives more events.
+SUM_COLUMNS = (
+    "use_amount",
+    "use_count",
+    "relapse_amount",
+    "relapse_count",
+    "craving_count",
+    "craving_intensity_sum",
+    "craving_intensity_count",
+    *TRIGGER_COLUMNS.values(),
+)
+
+
+def event_day(occurred_at: datetime) -> date:
+    if occurred_at.tzinfo is None:
+        return occurred_at.date()
+    return occurred_at.astimezone(timezone.utc).date()
+
+
+def _utc_day(db: Session, occurred_at):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.date(occurred_at)
+    return cast(func.timezone("UTC", occurred_at), Date)
+
+
+def _greatest(db: Session, left, right):
+    name = "max" if db.get_bind().dialect.name == "sqlite" else "greatest"
+    return getattr(func, name)(func.coalesce(left, right), func.coalesce(right, left))
+
+
+def _empty_row(program_id: uuid.UUID, day: date) -> dict:
+    row = {column: 0 for column in SUM_COLUMNS}
+    row.update(program_id=program_id, day=day, craving_intensity_max=None)
+    return row
+
+
+def record_events(db: Session, program_id: uuid.UUID, events: Iterable[Event]) -> None:
+    """Fold new events into their daily rows; runs in the caller's transaction."""
+    rows: dict[date, dict] = {}
+    for event in events:
+        day = event_day(event.occurred_at)
+        row = rows.get(day)
+        if row is None:
+            row = rows[day] = _empty_row(program_id, day)
+
+        amount = float(event.amount) if event.amount is not None else 0.0
+        if event.event_type == EventType.use.value:
+            row["use_amount"] += amount
+            row["use_count"] += 1
+        elif event.event_type == EventType.relapse.value:
+            row["relapse_amount"] += amount
+            row["relapse_count"] += 1
+        elif event.event_type == EventType.craving.value:
+            row["craving_count"] += 1
+            if event.intensity is not None:
+                row["craving_intensity_sum"] += event.intensity
+                row["craving_intensity_count"] += 1
+                current_max = row["craving_intensity_max"]
+                row["craving_intensity_max"] = max(event.intensity, current_max or event.intensity)
+        trigger_column = TRIGGER_COLUMNS.get(event.trigger or "")
+        if trigger_column:
+            row[trigger_column] += 1
+
+    if not rows:
+        return
+
+    dialect_insert = sqlite.insert if db.get_bind().dialect.name == "sqlite" else postgresql.insert
+    statement = dialect_insert(EventDailyStat).values(list(rows.values()))
+    excluded = statement.excluded
+    update_columns = {column: getattr(EventDailyStat, column) + getattr(excluded, column) for column in SUM_COLUMNS}
+    update_columns["craving_intensity_max"] = _greatest(
+        db, EventDailyStat.craving_intensity_max, excluded.craving_intensity_max
+    )
+    update_columns["updated_at"] = func.now()
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=[EventDailyStat.program_id, EventDailyStat.day],
+            set_=update_columns,
+        )
+    )
+
+
+def rebuild_daily_stats(db: Session, program_id: uuid.UUID | None = None) -> int:
+    """Recompute rollup rows from raw events for one program (or all of them).
+
+    Returns the number of daily rows written. The caller commits.
+    """
+    db.flush()
+    clear = delete(EventDailyStat)
+    if program_id is not None:
+        clear = clear.where(EventDailyStat.program_id == program_id)
+    db.execute(clear)
+
+    day = _utc_day(db, Event.occurred_at).label("day")
+    is_use = Event.event_type == EventType.use.value
+    is_relapse = Event.event_type == EventType.relapse.value
+    is_craving = Event.event_type == EventType.craving.value
+    has_intensity = is_craving & Event.intensity.isnot(None)
+
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+    def amount_where(condition):
+        return func.coalesce(func.sum(case((condition, Event.amount), else_=0)), 0)
+
+    aggregates = {
+        "use_amount": amount_where(is_use),
+        "use_count": count_where(is_use),
+        "relapse_amount": amount_where(is_relapse),
+        "relapse_count": count_where(is_relapse),
+        "craving_count": count_where(is_craving),
+        "craving_intensity_sum": func.coalesce(func.sum(case((has_intensity, Event.intensity), else_=0)), 0),
+        "craving_intensity_count": count_where(has_intensity),
+        "craving_intensity_max": func.max(case((is_craving, Event.intensity), else_=None)),
+        **{column: count_where(Event.trigger == trigger) for trigger, column in TRIGGER_COLUMNS.items()},
+    }
+    source = select(
+        Event.program_id,
+        day,
+        *(expression.label(column) for column, expression in aggregates.items()),
+    ).group_by(Event.program_id, day)
+    if program_id is not None:
+        source = source.where(Event.program_id == program_id)
+
+    columns = ["program_id", "day", *aggregates.keys()]
+    result = db.execute(insert(EventDailyStat).from_select(columns, source))
+    return result.rowcount or 0
+
+
+def load_daily_stats(db: Session, program_id: uuid.UUID, start: date, end: date) -> list[EventDailyStat]:
+    return (
+        db.query(EventDailyStat)
+        .filter(EventDailyStat.program_id == program_id, EventDailyStat.day >= start, EventDailyStat.day <= end)
+        .order_by(EventDailyStat.day)
+        .all()
+    )
+
+
+def rollup_aggregate_columns(db: Session, program_id, now: datetime) -> list:
+    """Scalar subqueries for ``ProgressAggregates`` fields, read mostly from the rollup.
+
+    ``program_id`` may be a value or a column of an enclosing query. The 7-day
+    window starts mid-day, so whole days come from the rollup and only the
+    events of the cutoff day itself are read raw. Relapse decay needs
+    per-event timestamps; relapses are rare and read through the
+    ``(program_id, event_type, occurred_at)`` index.
+    """
+    recent_cutoff = now - timedelta(days=RECENT_DAYS)
+    relapse_cutoff = now - timedelta(days=RELAPSE_DAYS)
+    cutoff_day = event_day(recent_cutoff)
+    cutoff_day_end = datetime.combine(cutoff_day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    now_param = bindparam("now", now, type_=DateTime(timezone=True))
+
+    def rollup_sum(expression):
+        return (
+            select(func.coalesce(func.sum(expression), 0))
+            .where(EventDailyStat.program_id == program_id, EventDailyStat.day > cutoff_day)
+            .scalar_subquery()
+        )
+
+    def edge(expression):
+        return (
+            select(expression)
+            .where(
+                Event.program_id == program_id,
+                Event.occurred_at >= recent_cutoff,
+                Event.occurred_at < cutoff_day_end,
+            )
+            .scalar_subquery()
+        )
+
+    def relapses(expression):
+        return (
+            select(expression)
+            .where(
+                Event.program_id == program_id,
+                Event.event_type == EventType.relapse.value,
+                Event.occurred_at >= relapse_cutoff,
+            )
+            .scalar_subquery()
+        )
+
+    days_ago = _days_ago(db, Event.occurred_at, now_param)
+    edge_amount = func.coalesce(
+        func.sum(Event.amount).filter(Event.event_type.in_((EventType.use.value, EventType.relapse.value))), 0
+    )
+    edge_cravings = func.count().filter(Event.event_type == EventType.craving.value)
+    return [
+        (rollup_sum(EventDailyStat.use_amount + EventDailyStat.relapse_amount) + edge(edge_amount)).label(
+            "recent_use_amount"
+        ),
+        (rollup_sum(EventDailyStat.craving_count) + edge(edge_cravings)).label("recent_cravings"),
+        relapses(func.coalesce(func.sum(func.exp(-case((days_ago < 0, 0), else_=days_ago) / 7.0)), 0)).label(
+            "relapse_decay_sum"
+        ),
+        relapses(func.count()).label("relapses"),
+    ]
+
+
+def aggregates_from_row(row) -> ProgressAggregates:
+    return ProgressAggregates(
+        recent_use_amount=float(row.recent_use_amount),
+        relapse_decay_sum=float(row.relapse_decay_sum),
+        recent_cravings=int(row.recent_cravings),
+        relapses=int(row.relapses),
+    )
+
+
+def load_progress_aggregates_from_rollup(db: Session, program_id: uuid.UUID, now: datetime) -> ProgressAggregates:
+    """``load_progress_aggregates`` over at most ~8 rollup rows instead of the raw 7-day window."""
+    row = db.execute(select(*rollup_aggregate_columns(db, program_id, now))).one()
+    return aggregates_from_row(row)
@@ -0,0 +1,121 @@
+import uuid
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.models import ProductProfile, Program
+from app.schemas.progress import DashboardOut
+from app.services.active_program import ActiveProgram, ProductProfileSnapshot, active_program_cache
+from app.services.daily_stats import aggregates_from_row, rollup_aggregate_columns
+from app.services.progress import (
+    ProgressAggregates,
+    calculate_progress_from_aggregates,
+    select_message_of_the_day,
+)
+from app.services.progress_cache import progress_cache, progress_cache_key
+
+
+def load_dashboard_state(
+    db: Session, user_id: uuid.UUID, now: datetime
+) -> tuple[ActiveProgram, ProgressAggregates] | None:
+    """Active program, profile and progress aggregates in a single round trip."""
+    active = (
+        select(
+            Program.id.label("program_id"),
+            Program.user_id,
+            Program.goal_type,
+            Program.started_at,
+            Program.is_active,
+            Program.ended_at,
+            Program.data_version,
+            Program.data_changed_at,
+            ProductProfile.id.label("profile_id"),
+            ProductProfile.product_type,
+            ProductProfile.baseline_amount,
+            ProductProfile.unit_label,
+            ProductProfile.strength_mg,
+            ProductProfile.cost_per_unit,
+        )
+        .join(ProductProfile, ProductProfile.program_id == Program.id)
+        .where(Program.user_id == user_id, Program.is_active.is_(True))
+        .limit(1)
+        .cte("active_program")
+    )
+    statement = select(active, *rollup_aggregate_columns(db, active.c.program_id, now))
+    row = db.execute(statement).first()
+    if row is None:
+        return None
+
+    program = ActiveProgram(
+        id=row.program_id,
+        user_id=row.user_id,
+        goal_type=row.goal_type,
+        started_at=row.started_at,
+        is_active=row.is_active,
+        ended_at=row.ended_at,
+        product_profile=ProductProfileSnapshot(
+            id=row.profile_id,
+            product_type=row.product_type,
+            baseline_amount=row.baseline_amount,
+            unit_label=row.unit_label,
+            strength_mg=row.strength_mg,
+            cost_per_unit=row.cost_per_unit,
+        ),
+        data_version=row.data_version,
+        data_changed_at=row.data_changed_at,
+    )
+    return program, aggregates_from_row(row)
+
+
+def build_dashboard(program: ActiveProgram, aggregates: ProgressAggregates, now: datetime) -> DashboardOut:
+    progress = calculate_progress_from_aggregates(program, aggregates, now)
+
+    baseline = progress["baseline_daily_amount"]
+    recent_avg = progress["recent_average_daily_amount"]
+    days_since = progress["days_since_start"]
+    cost_per_unit = program.product_profile.cost_per_unit
+    money_saved = None
+    if cost_per_unit is not None:
+        daily_savings = max(baseline - recent_avg, 0) * float(cost_per_unit)
+        money_saved = round(daily_savings * days_since, 2)
+
+    message = select_message_of_the_day(days_since)
+
+    return DashboardOut(
+        progress_percent=progress["progress_percent"],
+        days_since_start=days_since,
+        baseline_daily_amount=baseline,
+        recent_average_daily_amount=recent_avg,
+        money_saved_estimate=money_saved,
+        cravings_last_7_days=aggregates.recent_cravings,
+        relapses_last_30_days=aggregates.relapses,
+        message_of_the_day=message,
+    )
+
+
+def load_dashboard(
+    db: Session,
+    user_id: uuid.UUID,
+    now: datetime,
+    program: ActiveProgram | None = None,
+) -> tuple[ActiveProgram, DashboardOut] | None:
+    """Dashboard payload from the result cache, or from one statement on a miss.
+
+    ``program`` is an already resolved, current active program (see
+    ``cached_active_program``); with it a cached payload is served without
+    touching the database.
+    """
+    if program is not None:
+        cached = progress_cache.get(progress_cache_key("dashboard", program, now))
+        if cached is not None:
+            return program, cached
+
+    state = load_dashboard_state(db, user_id, now)
+    if state is None:
+        return None
+    program, aggregates = state
+    active_program_cache.set(user_id, program)
+    dashboard = build_dashboard(program, aggregates, now)
+    progress_cache.set(progress_cache_key("dashboard", program, now), dashboard)
+    return program, dashboard
@@ -0,0 +1,128 @@
+"""Streaming history export.
+
+Rows are read as plain column tuples through a server-side cursor
+(``yield_per``), so nothing lands in the identity map and memory stays
+bounded by one partition regardless of history size.
+
+The generators open their own session on the request session's engine
+and close it when the stream ends, so they never depend on the request
+session outliving the handler.
+"""
+
+import csv
+import io
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from typing import AsyncIterator, Iterator, Sequence
+
+from sqlalchemy import Select, select
+from sqlalchemy.engine import Connection, Engine, Result
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncResult, AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.enums import EventType
+from app.models.models import DiaryEntry, Event
+
+
+class ExportFormat(str, Enum):
+    ndjson = "ndjson"
+    csv = "csv"
+
+
+MEDIA_TYPES = {
+    ExportFormat.ndjson: "application/x-ndjson",
+    ExportFormat.csv: "text/csv; charset=utf-8",
+}
+
+EVENT_COLUMNS = ("id", "event_type", "amount", "intensity", "trigger", "notes", "occurred_at")
+DIARY_COLUMNS = ("id", "entry_date", "mood", "note", "created_at")
+
+
+def event_export_statement(
+    program_id: uuid.UUID,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    event_type: EventType | None = None,
+) -> Select:
+    statement = select(*(getattr(Event, name) for name in EVENT_COLUMNS)).where(Event.program_id == program_id)
+    if start:
+        statement = statement.where(Event.occurred_at >= start)
+    if end:
+        statement = statement.where(Event.occurred_at <= end)
+    if event_type:
+        statement = statement.where(Event.event_type == event_type.value)
+    return statement.order_by(Event.occurred_at, Event.id)
+
+
+def diary_export_statement(program_id: uuid.UUID, start: date | None = None, end: date | None = None) -> Select:
+    statement = select(*(getattr(DiaryEntry, name) for name in DIARY_COLUMNS)).where(
+        DiaryEntry.program_id == program_id
+    )
+    if start:
+        statement = statement.where(DiaryEntry.entry_date >= start)
+    if end:
+        statement = statement.where(DiaryEntry.entry_date <= end)
+    return statement.order_by(DiaryEntry.entry_date)
+
+
+def _plain(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _header(columns: Sequence[str], fmt: ExportFormat) -> str:
+    if fmt is ExportFormat.ndjson:
+        return ""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    return buffer.getvalue()
+
+
+def _format_rows(rows: Sequence, columns: Sequence[str], fmt: ExportFormat) -> str:
+    if fmt is ExportFormat.ndjson:
+        return "".join(json.dumps(dict(zip(columns, map(_plain, row)))) + "\n" for row in rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(["" if value is None else _plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+
+def _streamed(statement: Select) -> Select:
+    return statement.execution_options(yield_per=settings.export_batch_size)
+
+
+def iter_export(
+    bind: Engine | Connection, statement: Select, columns: Sequence[str], fmt: ExportFormat
+) -> Iterator[str]:
+    header = _header(columns, fmt)
+    if header:
+        yield header
+    with Session(bind) as db:
+        result: Result = db.execute(_streamed(statement))
+        for rows in result.partitions():
+            yield _format_rows(rows, columns, fmt)
+
+
+async def aiter_export(
+    bind: AsyncEngine, statement: Select, columns: Sequence[str], fmt: ExportFormat
+) -> AsyncIterator[str]:
+    header = _header(columns, fmt)
+    if header:
+        yield header
+    async with AsyncSession(bind) as db:
+        result: AsyncResult = await db.stream(_streamed(statement))
+        async for rows in result.partitions():
+            yield _format_rows(rows, columns, fmt)
+
+
+def content_disposition(name: str, fmt: ExportFormat) -> dict:
+    return {"Content-Disposition": f'attachment; filename="{name}.{fmt.value}"'}
@@ -0,0 +1,77 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import Integer, Numeric, cast, func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.models.models import DiaryEntry, EventDailyStat
+from app.schemas.insights import DailyInsightsOut
+
+
+def load_daily_rows(db: Session, program_id: uuid.UUID, start: date, end: date) -> list:
+    """Per-day diary mood and rollup craving/use stats, merged with ``GROUP BY day``."""
+    stats = select(
+        EventDailyStat.day.label("day"),
+        cast(null(), Integer).label("mood"),
+        EventDailyStat.craving_count,
+        EventDailyStat.craving_intensity_sum,
+        EventDailyStat.craving_intensity_count,
+        EventDailyStat.craving_intensity_max,
+        EventDailyStat.use_amount,
+    ).where(EventDailyStat.program_id == program_id, EventDailyStat.day >= start, EventDailyStat.day <= end)
+    moods = select(
+        DiaryEntry.entry_date.label("day"),
+        DiaryEntry.mood,
+        literal(0),
+        literal(0),
+        literal(0),
+        cast(null(), Integer),
+        cast(literal(0), Numeric(12, 2)),
+    ).where(DiaryEntry.program_id == program_id, DiaryEntry.entry_date >= start, DiaryEntry.entry_date <= end)
+
+    merged = union_all(stats, moods).subquery()
+    statement = (
+        select(
+            merged.c.day,
+            func.max(merged.c.mood).label("mood"),
+            func.sum(merged.c.craving_count).label("craving_count"),
+            func.sum(merged.c.craving_intensity_sum).label("intensity_sum"),
+            func.sum(merged.c.craving_intensity_count).label("intensity_count"),
+            func.max(merged.c.craving_intensity_max).label("intensity_max"),
+            func.sum(merged.c.use_amount).label("use_amount"),
+        )
+        .group_by(merged.c.day)
+        .order_by(merged.c.day)
+    )
+    return db.execute(statement).all()
+
+
+def build_daily_insights(rows: list, start: date, end: date) -> DailyInsightsOut:
+    """Spread sparse per-day rows over dense arrays covering ``start..end``."""
+    length = (end - start).days + 1
+    mood: list[int | None] = [None] * length
+    craving_count = [0] * length
+    intensity_avg: list[float | None] = [None] * length
+    intensity_max: list[int | None] = [None] * length
+    use_amount = [0.0] * length
+
+    for row in rows:
+        index = (row.day - start).days
+        if not 0 <= index < length:
+            continue
+        mood[index] = row.mood
+        craving_count[index] = int(row.craving_count or 0)
+        if row.intensity_count:
+            intensity_avg[index] = round(int(row.intensity_sum) / int(row.intensity_count), 2)
+        intensity_max[index] = row.intensity_max
+        use_amount[index] = round(float(row.use_amount or 0), 2)
+
+    return DailyInsightsOut(
+        start=start,
+        end=end,
+        mood=mood,
+        craving_count=craving_count,
+        craving_intensity_avg=intensity_avg,
+        craving_intensity_max=intensity_max,
+        use_amount=use_amount,
+    )
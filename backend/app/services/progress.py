@@ -1,9 +1,17 @@
-from datetime import datetime, timezone
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from math import exp
 from typing import Iterable
 
+from sqlalchemy import DateTime, bindparam, case, func, select
+from sqlalchemy.orm import Session
+
 from app.models.models import Event, Program
 
+RECENT_DAYS = 7
+RELAPSE_DAYS = 30
+
 
 def _days_between(start: datetime, end: datetime) -> int:
     if start.tzinfo is None:
@@ -36,17 +44,10 @@ def _relapse_penalty(relapse_events: Iterable[Event], now: datetime) -> float:
     return min(round(penalty, 4), 0.3)
 
 
-def calculate_progress(
-    program: Program,
-    recent_events: Iterable[Event],
-    relapse_events: Iterable[Event],
-    now: datetime,
-) -> dict:
+def _progress_result(program: Program, recent_avg: float, penalty: float, now: datetime) -> dict:
     baseline = float(program.product_profile.baseline_amount)
     days_since_start = _days_between(program.started_at, now) + 1
 
-    recent_avg = _recent_average(recent_events, 7)
-
     target_days = 90 if program.goal_type == "reduce_to_zero" else 30
     time_progress = min(days_since_start / max(target_days, 1), 1.0)
 
@@ -55,8 +56,6 @@ def calculate_progress(
     else:
         reduction_progress = max(min((baseline - recent_avg) / baseline, 1.0), 0.0)
 
-    penalty = _relapse_penalty(relapse_events, now)
-
     progress = (0.5 * time_progress) + (0.5 * reduction_progress) - penalty
     progress_percent = round(max(min(progress, 1.0), 0.0) * 100, 2)
 
@@ -69,6 +68,69 @@ def calculate_progress(
     }
 
 
+def calculate_progress(
+    program: Program,
+    recent_events: Iterable[Event],
+    relapse_events: Iterable[Event],
+    now: datetime,
+) -> dict:
+    recent_avg = _recent_average(recent_events, RECENT_DAYS)
+    penalty = _relapse_penalty(relapse_events, now)
+    return _progress_result(program, recent_avg, penalty, now)
+
+
+@dataclass(frozen=True)
+class ProgressAggregates:
+    recent_use_amount: float
+    relapse_decay_sum: float
+    recent_cravings: int
+    relapses: int
+
+
+def _days_ago(db: Session, occurred_at, now):
+    """SQL for ``_days_between(occurred_at, now)`` without the clamp at zero."""
+    if db.get_bind().dialect.name == "sqlite":
+        return func.floor(func.julianday(now) - func.julianday(occurred_at))
+    return func.floor(func.extract("epoch", now - occurred_at) / 86400)
+
+
+def load_progress_aggregates(db: Session, program_id: uuid.UUID, now: datetime) -> ProgressAggregates:
+    """Everything ``calculate_progress`` needs, summed in SQL in one round trip."""
+    now_param = bindparam("now", now, type_=DateTime(timezone=True))
+    recent_cutoff = now - timedelta(days=RECENT_DAYS)
+    relapse_cutoff = now - timedelta(days=RELAPSE_DAYS)
+    days_ago = _days_ago(db, Event.occurred_at, now_param)
+    is_recent = Event.occurred_at >= recent_cutoff
+    is_relapse = Event.event_type == "relapse"
+
+    statement = select(
+        func.coalesce(
+            func.sum(Event.amount).filter(is_recent, Event.event_type.in_(("use", "relapse"))), 0
+        ).label("recent_use_amount"),
+        func.coalesce(
+            func.sum(func.exp(-case((days_ago < 0, 0), else_=days_ago) / 7.0)).filter(is_relapse), 0
+        ).label("relapse_decay_sum"),
+        func.count().filter(is_recent, Event.event_type == "craving").label("recent_cravings"),
+        func.count().filter(is_relapse).label("relapses"),
+    ).where(
+        Event.program_id == program_id,
+        Event.occurred_at >= relapse_cutoff,
+    )
+    row = db.execute(statement).one()
+    return ProgressAggregates(
+        recent_use_amount=float(row.recent_use_amount),
+        relapse_decay_sum=float(row.relapse_decay_sum),
+        recent_cravings=row.recent_cravings,
+        relapses=row.relapses,
+    )
+
+
+def calculate_progress_from_aggregates(program: Program, aggregates: ProgressAggregates, now: datetime) -> dict:
+    recent_avg = round(aggregates.recent_use_amount / RECENT_DAYS, 2)
+    penalty = min(round(aggregates.relapse_decay_sum * 0.05, 4), 0.3)
+    return _progress_result(program, recent_avg, penalty, now)
+
+
 def select_message_of_the_day(days_since_start: int) -> str:
     messages = [
         "One day at a time. You are building momentum.",
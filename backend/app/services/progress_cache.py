@@ -0,0 +1,16 @@
+from datetime import datetime, timezone
+
+from app.config import settings
+from app.services.active_program import ActiveProgram
+from app.services.cache import TTLCache
+
+# Computed dashboard/progress payloads. Keys carry the program's data version
+# and the UTC day, so writes and day rollover never need explicit eviction.
+progress_cache = TTLCache(
+    max_entries=settings.progress_cache_max_entries,
+    ttl_seconds=settings.progress_cache_ttl_seconds,
+)
+
+
+def progress_cache_key(kind: str, program: ActiveProgram, now: datetime) -> tuple:
+    return (kind, program.id, program.data_version, now.astimezone(timezone.utc).date())
@@ -0,0 +1,79 @@
+"""Refresh token housekeeping: the per-user live cap and the purge job."""
+
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.models import RefreshToken
+
+
+@dataclass(frozen=True)
+class PurgeResult:
+    expired: int
+    revoked: int
+    batches: int
+
+
+def cap_live_tokens(db: Session, user_id: uuid.UUID, now: datetime, keep: int | None = None) -> int:
+    """Revoke the user's oldest live tokens beyond ``keep``; runs in the caller's transaction.
+
+    Newer tokens expire later, so ordering on ``expires_at`` keeps the most
+    recent sessions. Returns the number of tokens revoked; ``keep <= 0``
+    disables the cap.
+    """
+    keep = settings.refresh_token_max_live_per_user if keep is None else keep
+    if keep <= 0:
+        return 0
+    db.flush()
+    surplus = (
+        select(RefreshToken.id)
+        .where(RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None), RefreshToken.expires_at > now)
+        .order_by(RefreshToken.expires_at.desc(), RefreshToken.id.desc())
+        .offset(keep)
+    )
+    result = db.execute(
+        update(RefreshToken).where(RefreshToken.id.in_(surplus)).values(revoked_at=now),
+        execution_options={"synchronize_session": False},
+    )
+    return result.rowcount or 0
+
+
+def purge_refresh_tokens(
+    db: Session,
+    now: datetime,
+    batch_size: int | None = None,
+    revoked_retention: timedelta | None = None,
+    max_batches: int | None = None,
+) -> PurgeResult:
+    """Delete expired tokens and tokens revoked more than ``revoked_retention`` ago.
+
+    Works ``batch_size`` rows at a time and commits after each batch, so no
+    transaction holds row locks for longer than one small delete. Rows
+    locked by a concurrent refresh are skipped and picked up by a later run.
+    """
+    batch_size = settings.refresh_token_purge_batch_size if batch_size is None else batch_size
+    if revoked_retention is None:
+        revoked_retention = timedelta(days=settings.refresh_token_revoked_retention_days)
+    revoked_before = now - revoked_retention
+
+    expired = revoked = batches = 0
+    while max_batches is None or batches < max_batches:
+        rows = db.execute(
+            select(RefreshToken.id, (RefreshToken.expires_at <= now).label("expired"))
+            .where(or_(RefreshToken.expires_at <= now, RefreshToken.revoked_at < revoked_before))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        ).all()
+        if not rows:
+            break
+        db.execute(delete(RefreshToken).where(RefreshToken.id.in_([row.id for row in rows])))
+        db.commit()
+        batches += 1
+        batch_expired = sum(1 for row in rows if row.expired)
+        expired += batch_expired
+        revoked += len(rows) - batch_expired
+    return PurgeResult(expired=expired, revoked=revoked, batches=batches)
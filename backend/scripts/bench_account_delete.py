@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.session import Base  # noqa: E402
+from app.models.models import DiaryEntry, Event, ProductProfile, Program, RefreshToken, User  # noqa: E402
+from app.services.account_deletion import delete_account, purge_account_in_chunks  # noqa: E402
+from app.services.daily_stats import rebuild_daily_stats  # noqa: E402
+
+
+def seed_heavy_account(db, events: int, programs: int) -> uuid.UUID:
+    """One user with ``programs`` programs sharing ``events`` events, a year of diary and many old sessions."""
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    user = User(email=f"heavy-{uuid.uuid4().hex[:12]}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+
+    for index in range(programs):
+        program = Program(
+            user_id=user.id,
+            goal_type="reduce_to_zero",
+            started_at=now - timedelta(days=365),
+            is_active=index == programs - 1,
+        )
+        program.product_profile = ProductProfile(product_type="vape", baseline_amount=20, unit_label="puffs")
+        db.add(program)
+        db.flush()
+        db.execute(
+            insert(Event),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "program_id": program.id,
+                    "event_type": "craving" if rng.random() < 0.5 else "use",
+                    "amount": round(rng.uniform(0.5, 3), 2),
+                    "intensity": rng.randint(1, 10),
+                    "occurred_at": now - timedelta(minutes=rng.randint(0, 365 * 24 * 60)),
+                }
+                for _ in range(events // programs)
+            ],
+        )
+        db.execute(
+            insert(DiaryEntry),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "program_id": program.id,
+                    "entry_date": date.today() - timedelta(days=day),
+                    "mood": 5,
+                }
+                for day in range(365)
+            ],
+        )
+        rebuild_daily_stats(db, program.id)
+
+    db.execute(
+        insert(RefreshToken),
+        [
+            {"id": uuid.uuid4(), "user_id": user.id, "jti": uuid.uuid4().hex, "expires_at": now + timedelta(days=30)}
+            for _ in range(200)
+        ],
+    )
+    db.commit()
+    return user.id
+
+
+def timed(run) -> float:
+    started = time.perf_counter()
+    run()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare ORM cascade deletion with set-based account deletion.")
+    parser.add_argument("--events", type=int, default=50_000)
+    parser.add_argument("--programs", type=int, default=3)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--database-url", default=None, help="Defaults to a temporary SQLite file.")
+    args = parser.parse_args()
+
+    url = args.database_url or f"sqlite+pysqlite:///{Path(sys.argv[0]).resolve().parent / 'bench_account_delete.db'}"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+    results = {"events": args.events}
+    try:
+        db = SessionLocal()
+        try:
+            user_id = seed_heavy_account(db, args.events, args.programs)
+
+            def orm_cascade():
+                db.delete(db.get(User, user_id))
+                db.commit()
+
+            results["orm_cascade_s"] = round(timed(orm_cascade), 3)
+
+            user_id = seed_heavy_account(db, args.events, args.programs)
+
+            def set_based():
+                delete_account(db, user_id)
+                db.commit()
+
+            results["set_based_s"] = round(timed(set_based), 3)
+        finally:
+            db.close()
+
+        db = SessionLocal()
+        try:
+            user_id = seed_heavy_account(db, args.events, args.programs)
+        finally:
+            db.close()
+        results["chunked_background_s"] = round(
+            timed(lambda: purge_account_in_chunks(SessionLocal, user_id, batch_size=args.batch_size)), 3
+        )
+    finally:
+        engine.dispose()
+        if args.database_url is None:
+            Path(url.removeprefix("sqlite+pysqlite:///")).unlink(missing_ok=True)
+
+    print(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from fastapi.security import HTTPAuthorizationCredentials  # noqa: E402
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.db.session import Base  # noqa: E402
+from app.models.models import User  # noqa: E402
+from app.security.dependencies import get_current_principal, get_current_user_id, principal_cache  # noqa: E402
+from app.security.jwt import create_access_token, verified_token_cache  # noqa: E402
+
+
+def run(db, credentials: HTTPAuthorizationCredentials, iterations: int, cached: bool) -> float:
+    """Mean microseconds for get_current_user_id -> get_current_principal (principal cache warm)."""
+    verified_token_cache.clear()
+    max_entries = verified_token_cache.max_entries
+    verified_token_cache.max_entries = max_entries if cached else 0
+    try:
+        get_current_principal(get_current_user_id(credentials), db)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            get_current_principal(get_current_user_id(credentials), db)
+        return (time.perf_counter() - started) / iterations * 1e6
+    finally:
+        verified_token_cache.max_entries = max_entries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the auth dependency chain with and without the token cache.")
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite+pysqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        user = User(email="bench-auth@example.com", password_hash="x")
+        db.add(user)
+        db.commit()
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_access_token(user.id))
+        principal_cache.clear()
+
+        uncached = run(db, credentials, args.iterations, cached=False)
+        cached = run(db, credentials, args.iterations, cached=True)
+    finally:
+        db.close()
+        engine.dispose()
+
+    print(
+        {
+            "iterations": args.iterations,
+            "uncached_us": round(uncached, 2),
+            "cached_us": round(cached, 2),
+            "speedup": round(uncached / cached, 1),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
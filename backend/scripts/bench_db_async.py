@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import httpx  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.db.session import AsyncSessionLocal, get_async_engine  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+API = settings.api_prefix
+
+
+async def prepare_user(client: httpx.AsyncClient) -> dict:
+    register = await client.post(
+        f"{API}/auth/register",
+        json={"email": f"bench-{uuid4().hex[:12]}@example.com", "password": "BenchPass1!"},
+    )
+    register.raise_for_status()
+    headers = {"Authorization": f"Bearer {register.json()['access_token']}"}
+    program = await client.post(
+        f"{API}/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": (datetime.now(timezone.utc) - timedelta(days=14)).isoformat(),
+            "product_profile": {
+                "product_type": "vape",
+                "baseline_amount": 20,
+                "unit_label": "puffs",
+                "cost_per_unit": 0.1,
+            },
+        },
+    )
+    program.raise_for_status()
+    return headers
+
+
+async def worker(client: httpx.AsyncClient, headers: dict, deadline: float, counts: dict) -> None:
+    i = 0
+    while time.perf_counter() < deadline:
+        if i % 2 == 0:
+            response = await client.get(f"{API}/dashboard", headers=headers)
+        else:
+            response = await client.post(
+                f"{API}/events",
+                headers=headers,
+                json={
+                    "event_type": "craving",
+                    "intensity": 5,
+                    "occurred_at": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+        key = "ok" if 200 <= response.status_code < 300 else "errors"
+        counts[key] += 1
+        i += 1
+
+
+async def run_mode(database_async: bool, concurrency: int, seconds: float) -> dict:
+    settings.database_async = database_async
+    # One account drives every request; the per-account write limit would turn most of them into 429s.
+    settings.rate_limit_enabled = False
+    app = create_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        headers = await prepare_user(client)
+        counts = {"ok": 0, "errors": 0}
+        deadline = time.perf_counter() + seconds
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client, headers, deadline, counts) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    return {
+        "mode": "async" if database_async else "sync",
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 2),
+        "requests": counts["ok"] + counts["errors"],
+        "errors": counts["errors"],
+        "error_rate": round(counts["errors"] / max(counts["ok"] + counts["errors"], 1), 4),
+        # Only 2xx responses count; fast 429/500s would otherwise inflate throughput.
+        "requests_per_second": round(counts["ok"] / elapsed, 1),
+    }
+
+
+async def run(concurrency: int, seconds: float) -> list[dict]:
+    AsyncSessionLocal.configure(bind=get_async_engine())
+    results = []
+    for database_async in (False, True):
+        result = await run_mode(database_async, concurrency, seconds)
+        print(result)
+        results.append(result)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare dashboard/event throughput of the sync and async database paths against DATABASE_URL."
+    )
+    parser.add_argument("--concurrency", type=int, default=100, help="Concurrent in-flight requests.")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run.")
+    args = parser.parse_args()
+    results = asyncio.run(run(args.concurrency, args.seconds))
+    if any(result["errors"] for result in results):
+        sys.exit("Some requests failed; the throughput comparison is not valid.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from uuid import uuid4
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.config import settings  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+API = settings.api_prefix
+
+
+def prepare_user(client: TestClient) -> dict:
+    register = client.post(
+        f"{API}/auth/register",
+        json={"email": f"bench-{uuid4().hex[:12]}@example.com", "password": "BenchPass1!"},
+    )
+    register.raise_for_status()
+    headers = {"Authorization": f"Bearer {register.json()['access_token']}"}
+    program = client.post(
+        f"{API}/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": (datetime.now(timezone.utc) - timedelta(days=14)).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 20, "unit_label": "puffs"},
+        },
+    )
+    program.raise_for_status()
+    return headers
+
+
+def queued_events(count: int) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "event_type": "craving" if i % 3 else "use",
+            "amount": None if i % 3 else 1,
+            "intensity": 5 if i % 3 else None,
+            "occurred_at": (now - timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare replaying queued events one POST at a time against POST /events/batch on DATABASE_URL."
+    )
+    parser.add_argument("--events", type=int, default=200, help="Events per replay.")
+    parser.add_argument("--rounds", type=int, default=5, help="Replays per mode.")
+    args = parser.parse_args()
+
+    # Single-event replays exceed the per-account write limit by design.
+    settings.rate_limit_enabled = False
+    client = TestClient(create_app())
+    headers = prepare_user(client)
+    payload = queued_events(min(args.events, settings.event_batch_max_size))
+
+    single = 0.0
+    batch = 0.0
+    for _ in range(args.rounds):
+        started = time.perf_counter()
+        for item in payload:
+            client.post(f"{API}/events", headers=headers, json=item).raise_for_status()
+        single += time.perf_counter() - started
+
+        started = time.perf_counter()
+        client.post(f"{API}/events/batch", headers=headers, json=payload).raise_for_status()
+        batch += time.perf_counter() - started
+
+    print(
+        {
+            "events_per_replay": len(payload),
+            "rounds": args.rounds,
+            "single_seconds_per_replay": round(single / args.rounds, 4),
+            "batch_seconds_per_replay": round(batch / args.rounds, 4),
+            "speedup": round(single / batch, 1) if batch else None,
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.api.v1.responses import FastJSONResponse  # noqa: E402
+from app.db.session import Base  # noqa: E402
+from app.models.models import Event, ProductProfile, Program, User  # noqa: E402
+from app.schemas.event import EventOut  # noqa: E402
+
+EVENT_LIST = TypeAdapter(list[EventOut])
+
+
+def seed(db, count: int) -> uuid.UUID:
+    user = User(email=f"bench-{uuid.uuid4().hex[:12]}@example.com", password_hash="x")
+    program = Program(user=user, goal_type="reduce_to_zero", started_at=datetime.now(timezone.utc))
+    program.product_profile = ProductProfile(product_type="vape", baseline_amount=20, unit_label="puffs")
+    db.add(program)
+    db.flush()
+
+    rng = random.Random(1)
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        craving = rng.random() < 0.6
+        rows.append(
+            {
+                "id": uuid.uuid4(),
+                "program_id": program.id,
+                "event_type": "craving" if craving else "use",
+                "amount": None if craving else round(rng.uniform(0.5, 3), 2),
+                "intensity": rng.randint(1, 10) if craving else None,
+                "trigger": rng.choice(["stress", "social", None]),
+                "notes": None,
+                "occurred_at": now - timedelta(minutes=i),
+            }
+        )
+    db.execute(insert(Event), rows)
+    db.commit()
+    return program.id
+
+
+def timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+
+def run(count: int) -> dict:
+    engine = create_engine("sqlite+pysqlite://")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        program_id = seed(db, count)
+
+        db.expunge_all()
+        orm_query, orm_rows = timed(lambda: db.query(Event).filter(Event.program_id == program_id).all())
+        orm_encode, orm_body = timed(
+            lambda: EVENT_LIST.dump_json(EVENT_LIST.validate_python(orm_rows, from_attributes=True))
+        )
+
+        columns = [getattr(Event, name) for name in EventOut.model_fields]
+        fast_query, fast_rows = timed(lambda: db.query(*columns).filter(Event.program_id == program_id).all())
+        fast_encode, fast_body = timed(
+            lambda: FastJSONResponse([row._asdict() for row in fast_rows]).body
+        )
+    finally:
+        db.close()
+        engine.dispose()
+
+    return {
+        "events": count,
+        "orm_query_ms": round(orm_query * 1000, 1),
+        "pydantic_encode_ms": round(orm_encode * 1000, 1),
+        "row_query_ms": round(fast_query * 1000, 1),
+        "orjson_encode_ms": round(fast_encode * 1000, 1),
+        "total_speedup": round((orm_query + orm_encode) / (fast_query + fast_encode), 1),
+        "bytes": [len(orm_body), len(fast_body)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare ORM + pydantic list serialization against Row tuples + orjson."
+    )
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+    for count in args.sizes:
+        print(run(count))
+
+
+if __name__ == "__main__":
+    main()
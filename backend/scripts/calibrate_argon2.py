@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from passlib.hash import argon2  # noqa: E402
+
+from app.config import settings  # noqa: E402
+
+MAX_TIME_COST = 20
+
+
+def measure(time_cost: int, memory_cost: int, parallelism: int, samples: int) -> float:
+    hasher = argon2.using(rounds=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("CalibratePass1!")
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Pick Argon2 parameters whose hash time on this host is close to a target latency."
+    )
+    parser.add_argument("--target-ms", type=float, default=250.0)
+    parser.add_argument("--memory-kib", type=int, default=settings.argon2_memory_cost)
+    parser.add_argument("--parallelism", type=int, default=min(os.cpu_count() or 1, 4))
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+
+    # Memory is the main defence against GPU cracking, so keep it fixed and
+    # take the most passes that still fit the target (at least one).
+    chosen = None
+    for time_cost in range(1, MAX_TIME_COST + 1):
+        elapsed = measure(time_cost, args.memory_kib, args.parallelism, args.samples)
+        print({"time_cost": time_cost, "ms": round(elapsed, 1)})
+        if elapsed > args.target_ms and chosen is not None:
+            break
+        chosen = (time_cost, elapsed)
+
+    time_cost, elapsed = chosen
+    print(f"# median {elapsed:.0f} ms per hash; one worker handles ~{1000 / elapsed:.1f} hashes/s")
+    print(f"ARGON2_TIME_COST={time_cost}")
+    print(f"ARGON2_MEMORY_COST={args.memory_kib}")
+    print(f"ARGON2_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
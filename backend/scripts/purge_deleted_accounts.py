@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.account_deletion import pending_account_ids, purge_account_in_chunks  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Finish deleting accounts whose background purge was interrupted (deletion requested)."
+    )
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        user_ids = pending_account_ids(session)
+    finally:
+        session.close()
+
+    started = time.perf_counter()
+    for user_id in user_ids:
+        print({"user_id": str(user_id), **purge_account_in_chunks(SessionLocal, user_id, batch_size=args.batch_size)})
+    print({"accounts": len(user_ids), "seconds": round(time.perf_counter() - started, 3)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.refresh_tokens import purge_refresh_tokens  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Delete expired and long-revoked refresh tokens in small batches.")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows deleted per transaction.")
+    parser.add_argument(
+        "--revoked-retention-days",
+        type=int,
+        default=None,
+        help="Keep revoked tokens this many days before deleting them.",
+    )
+    parser.add_argument("--max-batches", type=int, default=None, help="Stop after this many batches.")
+    args = parser.parse_args()
+
+    retention = None if args.revoked_retention_days is None else timedelta(days=args.revoked_retention_days)
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        result = purge_refresh_tokens(
+            session,
+            datetime.now(timezone.utc),
+            batch_size=args.batch_size,
+            revoked_retention=retention,
+            max_batches=args.max_batches,
+        )
+    finally:
+        session.close()
+
+    print({**asdict(result), "seconds": round(time.perf_counter() - started, 3)})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import uuid
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.daily_stats import rebuild_daily_stats  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recompute event_daily_stats from raw events.")
+    parser.add_argument("--program-id", type=uuid.UUID, default=None, help="Only rebuild this program.")
+    args = parser.parse_args()
+
+    session = SessionLocal()
+    try:
+        rows = rebuild_daily_stats(session, args.program_id)
+        session.commit()
+        print({"program_id": str(args.program_id) if args.program_id else "all", "daily_rows": rows})
+    finally:
+        session.close()
+
+
+if __name__ == "__main__":
+    main()
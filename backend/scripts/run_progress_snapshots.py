@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from app.db.session import SessionLocal  # noqa: E402
+from app.services.snapshots import run_progress_snapshots  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write today's progress snapshot for every active program.")
+    parser.parse_args()
+
+    now = datetime.now(timezone.utc)
+    session = SessionLocal()
+    started = time.perf_counter()
+    try:
+        written = run_progress_snapshots(session, now)
+        session.commit()
+    finally:
+        session.close()
+
+    print(
+        {
+            "snapshot_date": now.date().isoformat(),
+            "programs": written,
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+    )
+
+
+if __name__ == "__main__":
+    main()
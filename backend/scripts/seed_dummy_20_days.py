@@ -15,6 +15,7 @@ from app.models.event import Event  # noqa: E402
 from app.models.product_profile import ProductProfile  # noqa: E402
 from app.models.program import Program  # noqa: E402
 from app.models.user import User  # noqa: E402
+from app.services.daily_stats import rebuild_daily_stats  # noqa: E402
 
 SEED_NOTE_PREFIX = "[seed-20d]"
 
@@ -157,6 +158,7 @@ def reseed_events(session, program: Program, days: int = 20) -> dict:
             )
             inserted += 1
 
+    rebuild_daily_stats(session, program.id)
     session.commit()
 
     recent_7 = (
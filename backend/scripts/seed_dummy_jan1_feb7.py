@@ -13,6 +13,7 @@ from app.models.user import User
 from app.models.program import Program
 from app.models.event import Event
 from app.models.enums import EventType, TriggerType
+from app.services.daily_stats import rebuild_daily_stats
 
 SEED_PREFIXES = ("[seed-20d]", "[seed-jan1]")
 
@@ -128,6 +129,7 @@ def main() -> None:
                 )
                 inserted += 1
 
+        rebuild_daily_stats(session, program.id)
         session.commit()
 
         seeded = (
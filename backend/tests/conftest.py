@@ -1,6 +1,8 @@
-﻿import pytest
+﻿from contextlib import contextmanager
+
+import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -9,6 +11,10 @@ from app.db.session import Base, get_db
 import app.models.models  # noqa: F401
 
 
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs a PostgreSQL database at TEST_POSTGRES_URL")
+
+
 @pytest.fixture(scope="session")
 def db_engine():
     engine = create_engine(
@@ -34,3 +40,23 @@ def client(db_engine):
     app = create_app()
     app.dependency_overrides[get_db] = override_get_db
     return TestClient(app)
+
+
+@pytest.fixture()
+def count_statements(db_engine):
+    """``with count_statements() as statements:`` collects the SQL sent to ``db_engine`` inside the block."""
+
+    @contextmanager
+    def counting():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(db_engine, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(db_engine, "before_cursor_execute", record)
+
+    return counting
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.db import session as db_session
+from app.db.replica import recent_writes
+from app.db.session import Base, get_async_db, get_db
+from app.main import create_app
+
+
+@pytest.fixture()
+def async_client(tmp_path, monkeypatch):
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite+pysqlite:///{db_path}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}", poolclass=NullPool)
+
+    TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=sync_engine)
+    TestingAsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
+    def override_get_db():
+        db = TestingSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
+
+    monkeypatch.setattr(settings, "database_async", True)
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as client:
+        yield client
+    sync_engine.dispose()
+
+
+def test_async_routes_round_trip(async_client):
+    register = async_client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    headers = {"Authorization": f"Bearer {register.json()['access_token']}"}
+
+    program = async_client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": (datetime.now(timezone.utc) - timedelta(days=3)).isoformat(),
+            "product_profile": {
+                "product_type": "vape",
+                "baseline_amount": 10,
+                "unit_label": "ml",
+                "cost_per_unit": 1.0,
+            },
+        },
+    )
+    assert program.status_code == 200
+
+    event = async_client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "use", "amount": 4, "occurred_at": datetime.now(timezone.utc).isoformat()},
+    )
+    assert event.status_code == 200
+    assert event.json()["amount"] == 4
+
+    listed = async_client.get("/api/v1/events", headers=headers)
+    assert listed.status_code == 200
+    assert len(listed.json()) == 1
+
+    exported = async_client.get("/api/v1/events/export", headers=headers)
+    assert exported.status_code == 200
+    assert len(exported.text.splitlines()) == 1
+
+    progress = async_client.get("/api/v1/progress", headers=headers)
+    assert progress.status_code == 200
+    assert progress.json()["recent_average_daily_amount"] == round(4 / 7, 2)
+
+    dashboard = async_client.get("/api/v1/dashboard", headers=headers)
+    assert dashboard.status_code == 200
+    assert dashboard.json()["days_since_start"] == 4
+
+    diary = async_client.get("/api/v1/diary", headers=headers)
+    assert diary.status_code == 200
+    assert diary.json() == []
+
+
+def test_async_reads_use_replica_outside_read_your_writes_window(async_client, tmp_path, monkeypatch):
+    # The replica never receives the program, so reads routed to it find none.
+    replica_path = tmp_path / "replica.db"
+    replica_sync_engine = create_engine(f"sqlite+pysqlite:///{replica_path}")
+    Base.metadata.create_all(bind=replica_sync_engine)
+    replica_sync_engine.dispose()
+    replica_engine = create_async_engine(f"sqlite+aiosqlite:///{replica_path}", poolclass=NullPool)
+    monkeypatch.setattr(
+        db_session,
+        "AsyncReadSessionLocal",
+        async_sessionmaker(bind=replica_engine, autoflush=False, expire_on_commit=False),
+    )
+    monkeypatch.setattr(settings, "replica_read_your_writes_seconds", 60)
+
+    register = async_client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    headers = {"Authorization": f"Bearer {register.json()['access_token']}"}
+    program = async_client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 10, "unit_label": "ml"},
+        },
+    )
+    assert program.status_code == 200
+
+    # As if the write had been handled by another worker.
+    recent_writes.clear()
+    assert async_client.get("/api/v1/events", headers=headers).status_code == 200
+
+    monkeypatch.setattr(settings, "replica_read_your_writes_seconds", 0)
+    assert async_client.get("/api/v1/events", headers=headers).status_code == 404
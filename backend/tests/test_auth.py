@@ -1,4 +1,20 @@
-﻿def test_register_and_login(client):
+﻿import threading
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt as jose_jwt
+from passlib.hash import argon2
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import get_db
+from app.main import create_app
+from app.models.models import User
+from app.security import jwt as jwt_module
+from app.security import passwords
+
+
+def test_register_and_login(client):
     register = client.post(
         "/api/v1/auth/register",
         json={"email": "a@example.com", "password": "StrongPass1!"},
@@ -14,3 +30,82 @@
     assert login.status_code == 200
     data = login.json()
     assert "access_token" in data and "refresh_token" in data
+
+
+def test_login_fails_fast_when_password_pool_is_saturated(client, monkeypatch):
+    client.post("/api/v1/auth/register", json={"email": "busy@example.com", "password": "StrongPass1!"})
+
+    full = threading.BoundedSemaphore(1)
+    full.acquire()
+    monkeypatch.setattr(passwords, "_slots", full)
+    login = client.post("/api/v1/auth/login", json={"email": "busy@example.com", "password": "StrongPass1!"})
+    assert login.status_code == 503
+    assert login.headers["retry-after"] == "1"
+
+
+def test_app_shutdown_reaps_password_workers(db_engine):
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    with TestClient(app) as client:
+        register = client.post("/api/v1/auth/register", json={"email": "reap@example.com", "password": "StrongPass1!"})
+        assert register.status_code == 200
+        workers = list(passwords._pool._processes.values())
+        assert workers
+    assert passwords._pool is None
+    assert not any(worker.is_alive() for worker in workers)
+
+
+def test_login_upgrades_hash_with_outdated_parameters(client, db_engine):
+    client.post("/api/v1/auth/register", json={"email": "rehash@example.com", "password": "StrongPass1!"})
+    db = sessionmaker(bind=db_engine)()
+    try:
+        user = db.query(User).filter(User.email == "rehash@example.com").one()
+        user.password_hash = argon2.using(rounds=1, memory_cost=8192, parallelism=1).hash("StrongPass1!")
+        db.commit()
+
+        login = client.post("/api/v1/auth/login", json={"email": "rehash@example.com", "password": "StrongPass1!"})
+        assert login.status_code == 200
+        db.refresh(user)
+        assert "t=3" in user.password_hash and "m=65536" in user.password_hash
+    finally:
+        db.close()
+
+
+def test_decode_token_caches_verified_access_claims(monkeypatch):
+    jwt_module.verified_token_cache.clear()
+    calls = []
+    real_decode = jose_jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(jwt_module.jwt, "decode", counting_decode)
+    token = jwt_module.create_access_token("4f0c7a52-0a4e-4a39-9d0f-6bfe0b7c4c11")
+
+    first = jwt_module.decode_token(token)
+    first["sub"] = "mutated by caller"
+    second = jwt_module.decode_token(token)
+    assert second["sub"] == "4f0c7a52-0a4e-4a39-9d0f-6bfe0b7c4c11"
+    assert len(calls) == 1
+
+    header, payload, signature = token.split(".")
+    tampered = f"{header}.{payload}.{signature[:-2]}{'AA' if signature[-2:] != 'AA' else 'BB'}"
+    with pytest.raises(HTTPException):
+        jwt_module.decode_token(tampered)
+    assert len(calls) == 2
+
+    monkeypatch.setattr(jwt_module, "_now", lambda: second["exp"] + 1)
+    with pytest.raises(HTTPException):
+        jwt_module.decode_token(token)
+    assert len(calls) == 2
+    assert len(jwt_module.verified_token_cache) == 0
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.models.models import DiaryEntry
+
+
+def _auth_header(client):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    token = register.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_program(client, headers):
+    return client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": (datetime.now(timezone.utc) - timedelta(days=5)).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 20, "unit_label": "ml"},
+        },
+    )
+
+
+def test_bootstrap_without_program(client):
+    headers = _auth_header(client)
+    body = client.get("/api/v1/bootstrap", headers=headers).json()
+    assert body["user"]["email"]
+    assert body["active_program"] is None
+    assert body["dashboard"] is None
+    assert body["diary"] == [] and body["cravings"] == []
+
+
+def test_bootstrap_returns_all_sections_in_few_statements(client, count_statements):
+    headers = _auth_header(client)
+    program = _create_program(client, headers).json()
+    now = datetime.now(timezone.utc)
+    client.post(
+        "/api/v1/events/batch",
+        headers=headers,
+        json=[
+            {"event_type": "craving", "intensity": 5, "occurred_at": now.isoformat()},
+            {"event_type": "craving", "intensity": 2, "occurred_at": (now - timedelta(days=40)).isoformat()},
+            {"event_type": "use", "amount": 1, "occurred_at": now.isoformat()},
+        ],
+    )
+    client.get("/api/v1/me", headers=headers)
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/bootstrap", headers=headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["active_program"]["id"] == program["id"]
+    assert body["dashboard"]["cravings_last_7_days"] == 1
+    assert body["dashboard"]["days_since_start"] == 6
+    assert [row["intensity"] for row in body["cravings"]] == [5]
+    assert body["diary"] == []
+    # Dashboard (program + aggregates), diary window and craving window.
+    assert len(statements) == 3, statements
+
+
+def test_bootstrap_returns_cursors_for_capped_lists(client, db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "list_page_size_max", 2)
+    headers = _auth_header(client)
+    program = _create_program(client, headers).json()
+    now = datetime.now(timezone.utc)
+    client.post(
+        "/api/v1/events/batch",
+        headers=headers,
+        json=[
+            {
+                "event_type": "craving",
+                "intensity": intensity,
+                "occurred_at": (now - timedelta(hours=intensity)).isoformat(),
+            }
+            for intensity in (1, 2, 3)
+        ],
+    )
+    db = sessionmaker(bind=db_engine)()
+    try:
+        db.add_all(
+            DiaryEntry(program_id=UUID(program["id"]), entry_date=now.date() - timedelta(days=days), mood=5)
+            for days in range(3)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    body = client.get("/api/v1/bootstrap", headers=headers).json()
+    assert [row["intensity"] for row in body["cravings"]] == [1, 2]
+    assert len(body["diary"]) == 2
+
+    cravings = client.get(
+        "/api/v1/events",
+        headers=headers,
+        params={"event_type": "craving", "limit": 2, "cursor": body["cravings_next_cursor"]},
+    )
+    assert [row["intensity"] for row in cravings.json()] == [3]
+    diary = client.get("/api/v1/diary", headers=headers, params={"limit": 2, "cursor": body["diary_next_cursor"]})
+    assert [row["entry_date"] for row in diary.json()] == [(now.date() - timedelta(days=2)).isoformat()]
+
+
+def test_bootstrap_omits_cursors_when_lists_fit(client):
+    headers = _auth_header(client)
+    _create_program(client, headers)
+    body = client.get("/api/v1/bootstrap", headers=headers).json()
+    assert body["diary_next_cursor"] is None and body["cravings_next_cursor"] is None
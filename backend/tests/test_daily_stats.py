@@ -0,0 +1,124 @@
+import random
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Event, EventDailyStat, ProductProfile, Program, User
+from app.services.daily_stats import load_progress_aggregates_from_rollup, rebuild_daily_stats, record_events
+from app.services.progress import load_progress_aggregates
+
+
+def _auth_header(client):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    token = register.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_program(client, headers):
+    return client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": (datetime.now(timezone.utc) - timedelta(days=10)).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 20, "unit_label": "ml"},
+        },
+    )
+
+
+def _rows(db, program_id):
+    columns = [column.name for column in EventDailyStat.__table__.columns if column.name != "updated_at"]
+    rows = db.query(EventDailyStat).filter(EventDailyStat.program_id == program_id).order_by(EventDailyStat.day)
+    return [{name: getattr(row, name) for name in columns} for row in rows]
+
+
+def test_create_event_updates_rollup_and_matches_rebuild(client, db_engine):
+    headers = _auth_header(client)
+    program_id = UUID(_create_program(client, headers).json()["id"])
+    today = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+
+    payloads = [
+        {"event_type": "use", "amount": 2.5, "occurred_at": today},
+        {"event_type": "use", "amount": 1, "occurred_at": today - timedelta(hours=1)},
+        {"event_type": "craving", "intensity": 7, "trigger": "stress", "occurred_at": today},
+        {"event_type": "craving", "intensity": 4, "trigger": "stress", "occurred_at": today},
+        {"event_type": "relapse", "amount": 3, "trigger": "alcohol", "occurred_at": today - timedelta(days=1)},
+    ]
+    for payload in payloads:
+        payload = {**payload, "occurred_at": payload["occurred_at"].isoformat()}
+        assert client.post("/api/v1/events", headers=headers, json=payload).status_code == 200
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        incremental = _rows(db, program_id)
+        rebuild_daily_stats(db, program_id)
+        db.commit()
+        rebuilt = _rows(db, program_id)
+    finally:
+        db.close()
+
+    assert incremental == rebuilt
+    yesterday, current = incremental
+    assert current["use_count"] == 2 and float(current["use_amount"]) == 3.5
+    assert current["craving_count"] == 2 and current["craving_intensity_sum"] == 11
+    assert current["craving_intensity_max"] == 7 and current["trigger_stress"] == 2
+    assert yesterday["relapse_count"] == 1 and yesterday["trigger_alcohol"] == 1
+
+
+def test_rollup_aggregates_match_raw_events(db_engine):
+    db = sessionmaker(bind=db_engine)()
+    rng = random.Random(11)
+    now = datetime.now(timezone.utc)
+    try:
+        user = User(email=f"{uuid4()}@example.com", password_hash="x")
+        program = Program(user=user, goal_type="reduce_to_zero", started_at=now - timedelta(days=40))
+        program.product_profile = ProductProfile(product_type="vape", baseline_amount=300, unit_label="puffs")
+        db.add(program)
+        db.flush()
+        events = []
+        for _ in range(1500):
+            event_type = rng.choices(["use", "craving", "relapse"], weights=[300, 197, 3])[0]
+            events.append(
+                Event(
+                    program_id=program.id,
+                    event_type=event_type,
+                    amount=None if event_type == "craving" else round(rng.uniform(0.5, 3), 2),
+                    intensity=rng.randint(1, 10),
+                    occurred_at=now - timedelta(seconds=rng.randint(0, 35 * 86400)),
+                )
+            )
+        db.add_all(events)
+        record_events(db, program.id, events)
+        db.commit()
+
+        raw = load_progress_aggregates(db, program.id, now)
+        rollup = load_progress_aggregates_from_rollup(db, program.id, now)
+    finally:
+        db.close()
+
+    assert abs(rollup.recent_use_amount - raw.recent_use_amount) < 0.01
+    assert rollup.recent_cravings == raw.recent_cravings
+    assert rollup.relapses == raw.relapses
+    assert abs(rollup.relapse_decay_sum - raw.relapse_decay_sum) < 1e-9
+
+
+def test_reset_progress_clears_rollup(client, db_engine):
+    headers = _auth_header(client)
+    program_id = UUID(_create_program(client, headers).json()["id"])
+    client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "use", "amount": 1, "occurred_at": datetime.now(timezone.utc).isoformat()},
+    )
+
+    assert client.post("/api/v1/programs/active/test/reset-progress", headers=headers).status_code == 200
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        assert _rows(db, program_id) == []
+    finally:
+        db.close()
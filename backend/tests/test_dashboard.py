@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.services import active_program, dashboard
+from app.services.cache import TTLCache
+
+
+def _auth_header(client):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    token = register.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_program(client, headers, started_at):
+    return client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": started_at.isoformat(),
+            "product_profile": {
+                "product_type": "vape",
+                "baseline_amount": 20,
+                "unit_label": "ml",
+                "cost_per_unit": 0.5,
+            },
+        },
+    )
+
+
+def test_dashboard_is_a_single_statement(client, count_statements):
+    headers = _auth_header(client)
+    now = datetime.now(timezone.utc)
+    assert _create_program(client, headers, now - timedelta(days=10)).status_code == 200
+    for payload in (
+        {"event_type": "use", "amount": 7, "occurred_at": now - timedelta(hours=1)},
+        {"event_type": "use", "amount": 3.5, "occurred_at": now - timedelta(days=3)},
+        {"event_type": "use", "amount": 100, "occurred_at": now - timedelta(days=8)},
+        {"event_type": "craving", "intensity": 6, "occurred_at": now - timedelta(hours=2)},
+        {"event_type": "relapse", "amount": 2, "occurred_at": now - timedelta(days=20)},
+    ):
+        payload = {**payload, "occurred_at": payload["occurred_at"].isoformat()}
+        assert client.post("/api/v1/events", headers=headers, json=payload).status_code == 200
+
+    with count_statements() as statements:
+        response = client.get("/api/v1/dashboard", headers=headers)
+
+    assert response.status_code == 200
+    assert len(statements) == 1, statements
+    body = response.json()
+    assert body["days_since_start"] == 11
+    assert body["recent_average_daily_amount"] == 1.5
+    assert body["cravings_last_7_days"] == 1
+    assert body["relapses_last_30_days"] == 1
+    assert body["money_saved_estimate"] == round((20 - 1.5) * 0.5 * 11, 2)
+
+
+def test_dashboard_without_program_is_404(client):
+    headers = _auth_header(client)
+    response = client.get("/api/v1/dashboard", headers=headers)
+    assert response.status_code == 404
+    assert response.json()["error"] == "No active program"
+
+
+def test_dashboard_is_cached_until_the_next_write(client, count_statements):
+    headers = _auth_header(client)
+    now = datetime.now(timezone.utc)
+    assert _create_program(client, headers, now - timedelta(days=2)).status_code == 200
+    first = client.get("/api/v1/dashboard", headers=headers).json()
+
+    with count_statements() as statements:
+        assert client.get("/api/v1/dashboard", headers=headers).json() == first
+        assert client.get("/api/v1/progress", headers=headers).status_code == 200
+        assert client.get("/api/v1/progress", headers=headers).status_code == 200
+    # One data-version check per request; only the first /progress aggregates.
+    version_checks = [statement for statement in statements if statement.startswith("SELECT programs.data_version")]
+    assert len(version_checks) == 3, statements
+    assert len(statements) == 4, statements
+
+    client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "craving", "intensity": 4, "occurred_at": now.isoformat()},
+    )
+    assert client.get("/api/v1/dashboard", headers=headers).json()["cravings_last_7_days"] == 1
+
+    client.patch("/api/v1/programs/active/product-profile", headers=headers, json={"cost_per_unit": 2})
+    after_cost = client.get("/api/v1/dashboard", headers=headers).json()
+    assert after_cost["money_saved_estimate"] == round(20 * 2 * 3, 2)
+
+
+def test_dashboard_and_programs_return_304_for_current_etag(client):
+    headers = _auth_header(client)
+    assert _create_program(client, headers, datetime.now(timezone.utc)).status_code == 200
+
+    for url in ("/api/v1/dashboard", "/api/v1/progress", "/api/v1/programs", "/api/v1/diary"):
+        first = client.get(url, headers=headers)
+        assert first.status_code == 200
+        again = client.get(url, headers={**headers, "If-None-Match": first.headers["etag"]})
+        assert again.status_code == 304, url
+
+    programs_etag = client.get("/api/v1/programs", headers=headers).headers["etag"]
+    client.patch("/api/v1/programs/active/product-profile", headers=headers, json={"cost_per_unit": 4})
+    refreshed = client.get("/api/v1/programs", headers={**headers, "If-None-Match": programs_etag})
+    assert refreshed.status_code == 200
+
+
+def test_write_on_one_worker_refreshes_another_workers_reads(client, monkeypatch):
+    headers = _auth_header(client)
+    now = datetime.now(timezone.utc)
+    assert _create_program(client, headers, now - timedelta(days=2)).status_code == 200
+    caches = {"reader": TTLCache(100, 60), "writer": TTLCache(100, 60)}
+
+    def on_worker(name):
+        # Each worker keeps its own active-program cache.
+        monkeypatch.setattr(active_program, "active_program_cache", caches[name])
+        monkeypatch.setattr(dashboard, "active_program_cache", caches[name])
+
+    on_worker("reader")
+    first = client.get("/api/v1/dashboard", headers=headers)
+    events_etag = client.get("/api/v1/events", headers=headers).headers["etag"]
+    assert first.json()["cravings_last_7_days"] == 0
+
+    on_worker("writer")
+    written = client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "craving", "intensity": 4, "occurred_at": now.isoformat()},
+    )
+    assert written.status_code == 200
+
+    on_worker("reader")
+    assert len(caches["reader"]) == 1
+    stale = client.get("/api/v1/dashboard", headers={**headers, "If-None-Match": first.headers["etag"]})
+    assert stale.status_code == 200
+    assert stale.json()["cravings_last_7_days"] == 1
+    assert client.get("/api/v1/events", headers={**headers, "If-None-Match": events_etag}).status_code == 200
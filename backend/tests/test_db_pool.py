@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from app.config import settings
+from app.db.pool import InstrumentedQueuePool, instrument_engine, pool_options, pool_status
+
+
+@pytest.fixture()
+def pool_engine(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "db_pool_size", 1)
+    monkeypatch.setattr(settings, "db_max_overflow", 0)
+    monkeypatch.setattr(settings, "db_pool_timeout", 0.05)
+    monkeypatch.setattr(settings, "db_pool_pre_ping", "always")
+    engine = create_engine(f"sqlite+pysqlite:///{tmp_path / 'pool.db'}", **pool_options(InstrumentedQueuePool))
+    stats = instrument_engine("test_pool", engine)
+    yield engine, stats
+    engine.dispose()
+
+
+def test_pool_stats_track_checkouts_and_timeouts(pool_engine):
+    engine, stats = pool_engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status()["test_pool"]
+        assert status["checked_out"] == 1
+        assert status["overflow"] == 0
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 1
+    assert snapshot["checkout_timeouts"] == 1
+    assert sum(snapshot["checkout_histogram"].values()) == 1
+    assert snapshot["checkout_max_ms"] < settings.db_pool_timeout * 1000
+    assert pool_status()["test_pool"]["checked_out"] == 0
+
+
+def test_pre_ping_failure_is_counted_and_connection_replaced(pool_engine, monkeypatch):
+    engine, stats = pool_engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    calls = {"count": 0}
+
+    def flaky_ping(dbapi_connection):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            # The message pysqlite's dialect recognises as a disconnect.
+            raise engine.dialect.loaded_dbapi.ProgrammingError("Cannot operate on a closed database.")
+        return True
+
+    monkeypatch.setattr(engine.dialect, "do_ping", flaky_ping)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    snapshot = stats.snapshot()
+    assert snapshot["pre_ping_failures"] == 1
+
+
+def test_pre_ping_error_that_is_not_a_disconnect_propagates_uncounted(pool_engine, monkeypatch):
+    engine, stats = pool_engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+    def locked_ping(dbapi_connection):
+        raise engine.dialect.loaded_dbapi.OperationalError("database is locked")
+
+    monkeypatch.setattr(engine.dialect, "do_ping", locked_ping)
+    with pytest.raises(exc.OperationalError, match="database is locked"):
+        engine.connect()
+
+    snapshot = stats.snapshot()
+    assert snapshot["pre_pings"] == 0
+    assert snapshot["pre_ping_failures"] == 0
+
+
+def test_internal_pool_endpoint(client):
+    response = client.get("/api/v1/internal/db-pool")
+    assert response.status_code == 200
+    assert "primary" in response.json()
@@ -1,6 +1,8 @@
 ﻿from datetime import datetime, timezone
 from uuid import uuid4
 
+from app.api.v1.endpoints import diary as diary_endpoint
+
 
 def _auth_header(client):
     register = client.post(
@@ -30,8 +32,6 @@ def _create_program(client, headers):
 
 
 def test_diary_requires_18_utc_cutoff(client, monkeypatch):
-    from app.api.v1.endpoints import diary as diary_endpoint
-
     headers = _auth_header(client)
     program = _create_program(client, headers)
     assert program.status_code == 200
@@ -52,8 +52,6 @@ def test_diary_requires_18_utc_cutoff(client, monkeypatch):
 
 
 def test_diary_list_returns_entries(client, monkeypatch):
-    from app.api.v1.endpoints import diary as diary_endpoint
-
     headers = _auth_header(client)
     program = _create_program(client, headers)
     assert program.status_code == 200
@@ -68,3 +66,30 @@ def test_diary_list_returns_entries(client, monkeypatch):
     assert len(body) == 1
     assert body[0]["mood"] == 5
     assert body[0]["note"] == "test note"
+
+
+def test_diary_list_pages_by_entry_date(client, monkeypatch):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    for day in (3, 4, 5):
+        monkeypatch.setattr(diary_endpoint, "_now_utc", lambda day=day: datetime(2026, 2, day, 19, 0, tzinfo=timezone.utc))
+        assert client.post("/api/v1/diary", headers=headers, json={"mood": day}).status_code == 200
+
+    first = client.get("/api/v1/diary?limit=2", headers=headers)
+    assert [row["entry_date"] for row in first.json()] == ["2026-02-05", "2026-02-04"]
+    second = client.get(f"/api/v1/diary?limit=2&cursor={first.headers['x-next-cursor']}", headers=headers)
+    assert [row["entry_date"] for row in second.json()] == ["2026-02-03"]
+    assert "x-next-cursor" not in second.headers
+
+
+def test_list_diary_columnar_format(client, monkeypatch):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    monkeypatch.setattr(diary_endpoint, "_now_utc", lambda: datetime(2026, 2, 3, 20, 0, tzinfo=timezone.utc))
+    assert client.post("/api/v1/diary", headers=headers, json={"mood": 6}).status_code == 200
+
+    columnar = client.get("/api/v1/diary?format=columnar", headers=headers)
+    assert columnar.json() == {
+        "entry_date": [int(datetime(2026, 2, 3, tzinfo=timezone.utc).timestamp())],
+        "mood": [6],
+    }
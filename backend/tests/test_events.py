@@ -1,5 +1,16 @@
-﻿from datetime import datetime, timezone
-from uuid import uuid4
+﻿import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import UUID, uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import settings
+from app.models.models import Event
+from app.schemas.event import EventOut
+from app.services.export import EVENT_COLUMNS, ExportFormat, event_export_statement, iter_export
 
 
 def _auth_header(client):
@@ -82,3 +93,237 @@ def test_list_events_can_filter_cravings(client):
     assert len(body) == 1
     assert body[0]["event_type"] == "craving"
     assert body[0]["intensity"] == 7
+
+
+def test_list_events_supports_conditional_requests(client, count_statements):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    url = "/api/v1/events?event_type=craving&start=2026-01-01T00:00:00Z"
+
+    first = client.get(url, headers=headers)
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+    assert "last-modified" in first.headers
+
+    with count_statements() as statements:
+        cached = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    assert not [statement for statement in statements if "FROM events" in statement]
+
+    other_query = client.get("/api/v1/events?event_type=use", headers={**headers, "If-None-Match": etag})
+    assert other_query.status_code == 200
+
+    client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "craving", "intensity": 5, "occurred_at": datetime.now(timezone.utc).isoformat()},
+    )
+    changed = client.get(url, headers={**headers, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert len(changed.json()) == 1
+
+    since = client.get(url, headers={**headers, "If-Modified-Since": changed.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_list_events_pages_with_keyset_cursor(client, monkeypatch):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    base = datetime.now(timezone.utc).replace(microsecond=0)
+    # Two events share a timestamp so the id tie-breaker is exercised.
+    stamps = [base, base, base - timedelta(minutes=1), base - timedelta(minutes=2), base - timedelta(minutes=3)]
+    for stamp in stamps:
+        client.post(
+            "/api/v1/events",
+            headers=headers,
+            json={"event_type": "craving", "intensity": 3, "occurred_at": stamp.isoformat()},
+        )
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        url = "/api/v1/events?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert len(response.json()) <= 2
+        seen.extend(response.json())
+        pages += 1
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+
+    assert pages == 3
+    assert len({row["id"] for row in seen}) == len(stamps)
+    assert [row["occurred_at"] for row in seen] == sorted((row["occurred_at"] for row in seen), reverse=True)
+
+    monkeypatch.setattr(settings, "list_page_size_max", 3)
+    capped = client.get("/api/v1/events?limit=100", headers=headers)
+    assert len(capped.json()) == 3
+    assert capped.headers["x-next-cursor"]
+
+    # Without a limit the list stays complete for callers that ignore the cursor.
+    unpaginated = client.get("/api/v1/events", headers=headers)
+    assert len(unpaginated.json()) == len(stamps)
+    assert "x-next-cursor" not in unpaginated.headers
+
+    assert client.get("/api/v1/events?cursor=not-a-cursor", headers=headers).status_code == 400
+
+
+def test_export_events_streams_ndjson_and_csv(client, db_engine):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    now = datetime.now(timezone.utc)
+    created = client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "use", "amount": 1.5, "occurred_at": now.isoformat()},
+    )
+    client.post(
+        "/api/v1/events",
+        headers=headers,
+        json={"event_type": "craving", "intensity": 6, "trigger": "stress", "occurred_at": now.isoformat()},
+    )
+
+    ndjson = client.get("/api/v1/events/export", headers=headers)
+    assert ndjson.status_code == 200
+    assert ndjson.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in ndjson.text.splitlines()]
+    assert {row["event_type"] for row in rows} == {"use", "craving"}
+    assert next(row for row in rows if row["event_type"] == "use")["amount"] == 1.5
+
+    exported = client.get("/api/v1/events/export?format=csv&event_type=craving", headers=headers)
+    assert exported.headers["content-type"].startswith("text/csv")
+    assert 'filename="events.csv"' in exported.headers["content-disposition"]
+    records = list(csv.DictReader(io.StringIO(exported.text)))
+    assert len(records) == 1
+    assert records[0]["trigger"] == "stress"
+    assert records[0]["amount"] == ""
+
+    # The stream must not rely on the request session, which older FastAPI
+    # releases close before the body is sent.
+    with Session(db_engine) as request_db:
+        statement = event_export_statement(request_db.get(Event, UUID(created.json()["id"])).program_id)
+        stream = iter_export(request_db.get_bind(), statement, EVENT_COLUMNS, ExportFormat.ndjson)
+    assert len("".join(stream).splitlines()) == 2
+
+
+def test_batch_create_events_reports_per_item_errors(client, count_statements):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    now = datetime.now(timezone.utc).isoformat()
+    batch = [
+        {"event_type": "use", "amount": 2, "occurred_at": now},
+        {"event_type": "use", "occurred_at": now},
+        {"event_type": "craving", "intensity": 11, "occurred_at": now},
+        {"event_type": "craving", "intensity": 4, "trigger": "social", "occurred_at": now},
+        "not an event",
+    ]
+
+    with count_statements() as statements:
+        response = client.post("/api/v1/events/batch", headers=headers, json=batch)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["event_type"] for item in body["created"]] == ["use", "craving"]
+    assert [error["index"] for error in body["errors"]] == [1, 2, 4]
+    assert "amount is required" in body["errors"][0]["errors"][0]
+    assert len([statement for statement in statements if statement.startswith("INSERT INTO events")]) == 1
+
+    listed = client.get("/api/v1/events", headers=headers).json()
+    assert len(listed) == 2
+    dashboard = client.get("/api/v1/dashboard", headers=headers).json()
+    assert dashboard["cravings_last_7_days"] == 1
+
+
+def test_batch_create_events_enforces_max_size(client, monkeypatch):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    monkeypatch.setattr(settings, "event_batch_max_size", 2)
+    now = datetime.now(timezone.utc).isoformat()
+    batch = [{"event_type": "craving", "occurred_at": now}] * 3
+    assert client.post("/api/v1/events/batch", headers=headers, json=batch).status_code == 400
+
+
+def test_fast_list_path_matches_pydantic_serialization(client, db_engine):
+    headers = _auth_header(client)
+    program_id = UUID(_create_program(client, headers).json()["id"])
+    now = datetime.now(timezone.utc)
+    client.post(
+        "/api/v1/events/batch",
+        headers=headers,
+        json=[
+            {"event_type": "use", "amount": 1.25, "notes": "after lunch", "occurred_at": now.isoformat()},
+            {"event_type": "craving", "intensity": 8, "trigger": "after_meal", "occurred_at": now.isoformat()},
+        ],
+    )
+
+    fast = client.get("/api/v1/events", headers=headers)
+    assert fast.headers["content-type"] == "application/json"
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        rows = (
+            db.query(Event)
+            .filter(Event.program_id == program_id)
+            .order_by(Event.occurred_at.desc(), Event.id.desc())
+            .all()
+        )
+        adapter = TypeAdapter(list[EventOut])
+        expected = adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+    finally:
+        db.close()
+    assert fast.content == expected
+
+
+def _decode_columnar(body, timestamps=("occurred_at",)):
+    """Turn a columnar list body back into row dicts with aware datetimes."""
+    fields = list(body)
+    rows = [dict(zip(fields, values)) for values in zip(*body.values())]
+    for row in rows:
+        for name in timestamps:
+            row[name] = datetime.fromtimestamp(row[name], tz=timezone.utc)
+    return rows
+
+
+def test_list_events_columnar_format(client):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    client.post(
+        "/api/v1/events/batch",
+        headers=headers,
+        json=[
+            {"event_type": "use", "amount": 1.5, "notes": "coffee", "occurred_at": now.isoformat()},
+            {"event_type": "craving", "intensity": 7, "trigger": "stress", "occurred_at": now.isoformat()},
+        ],
+    )
+
+    rows = client.get("/api/v1/events", headers=headers)
+    by_query = client.get("/api/v1/events?format=columnar", headers=headers)
+    by_accept = client.get(
+        "/api/v1/events", headers={**headers, "Accept": "application/vnd.quitotine.columnar+json"}
+    )
+    assert by_query.headers["content-type"] == "application/vnd.quitotine.columnar+json"
+    assert by_query.json() == by_accept.json()
+    assert "Accept" in by_accept.headers["vary"]
+    assert by_accept.headers["etag"] != rows.headers["etag"]
+
+    body = by_query.json()
+    assert list(body) == ["occurred_at", "event_type", "amount", "intensity", "trigger"]
+    assert all(isinstance(value, int) for value in body["occurred_at"])
+    decoded = _decode_columnar(body)
+    expected = [
+        {
+            # SQLite hands back naive UTC timestamps.
+            "occurred_at": datetime.fromisoformat(row["occurred_at"].removesuffix("Z")).replace(tzinfo=timezone.utc),
+            **{name: row[name] for name in ("event_type", "amount", "intensity", "trigger")},
+        }
+        for row in rows.json()
+    ]
+    assert decoded == expected
+    assert decoded[0]["occurred_at"] == now
+    assert len(by_query.content) < len(rows.content)
@@ -0,0 +1,72 @@
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+from app.api.v1.endpoints import diary as diary_endpoint
+
+
+def _auth_header(client):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    token = register.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _create_program(client, headers):
+    return client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 20, "unit_label": "ml"},
+        },
+    )
+
+
+def test_daily_insights_returns_dense_arrays(client, monkeypatch):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    day_one = datetime(2026, 2, 3, 12, 0, tzinfo=timezone.utc)
+    day_three = day_one + timedelta(days=2)
+    events = [
+        {"event_type": "craving", "intensity": 4, "occurred_at": day_one.isoformat()},
+        {"event_type": "craving", "intensity": 9, "occurred_at": (day_one + timedelta(hours=2)).isoformat()},
+        {"event_type": "craving", "occurred_at": day_one.isoformat()},
+        {"event_type": "use", "amount": 2.5, "occurred_at": day_three.isoformat()},
+    ]
+    assert client.post("/api/v1/events/batch", headers=headers, json=events).status_code == 200
+    monkeypatch.setattr(diary_endpoint, "_now_utc", lambda: datetime(2026, 2, 4, 19, 0, tzinfo=timezone.utc))
+    assert client.post("/api/v1/diary", headers=headers, json={"mood": 7}).status_code == 200
+
+    response = client.get("/api/v1/insights/daily?start=2026-02-02&end=2026-02-06", headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {
+        "start": "2026-02-02",
+        "end": "2026-02-06",
+        "mood": [None, None, 7, None, None],
+        "craving_count": [0, 3, 0, 0, 0],
+        "craving_intensity_avg": [None, 6.5, None, None, None],
+        "craving_intensity_max": [None, 9, None, None, None],
+        "use_amount": [0.0, 0.0, 0.0, 2.5, 0.0],
+    }
+
+
+def test_daily_insights_default_range_and_validation(client):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+    today = datetime.now(timezone.utc).date()
+
+    body = client.get("/api/v1/insights/daily", headers=headers).json()
+    assert body["start"] == date(today.year, 1, 1).isoformat()
+    assert body["end"] == today.isoformat()
+    assert len(body["mood"]) == (today - date(today.year, 1, 1)).days + 1
+
+    reversed_range = client.get("/api/v1/insights/daily?start=2026-02-02&end=2026-02-01", headers=headers)
+    assert reversed_range.status_code == 400
+    too_long = client.get("/api/v1/insights/daily?start=2020-01-01&end=2026-01-01", headers=headers)
+    assert too_long.status_code == 400
+    # An omitted end resolves to today before the range is checked.
+    open_ended = client.get(f"/api/v1/insights/daily?start={today.year - 6}-01-01", headers=headers)
+    assert open_ended.status_code == 400
@@ -4,7 +4,11 @@ from uuid import uuid4
 
 from sqlalchemy.orm import sessionmaker
 
+from app.api.v1.endpoints import profile
+from app.config import settings
 from app.models.models import Event, ProductProfile, Program, RefreshToken, User
+from app.security.dependencies import principal_cache
+from app.services.account_deletion import deactivate_account, pending_account_ids, purge_account_in_chunks
 
 
 def _register(client, email: str):
@@ -88,3 +92,121 @@ def test_delete_profile_removes_user_and_related_data(client, db_engine):
         json={"email": email, "password": "StrongPass1!"},
     )
     assert register_again.status_code == 200
+
+
+def test_profile_reads_are_cached_and_invalidated_on_update(client, count_statements):
+    token = _register(client, f"{uuid4()}@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    first = client.get("/api/v1/profile", headers=headers)
+    assert first.status_code == 200
+    user_id = UUID(first.json()["id"])
+    assert principal_cache.get(user_id) is not None
+
+    with count_statements() as statements:
+        cached = client.get("/api/v1/profile", headers=headers)
+    assert cached.status_code == 200
+    assert statements == []
+
+    renamed = client.patch("/api/v1/profile", headers=headers, json={"display_name": "Renamed"})
+    assert renamed.status_code == 200
+    assert principal_cache.get(user_id) is None
+
+    after = client.get("/api/v1/profile", headers=headers)
+    assert after.json()["display_name"] == "Renamed"
+
+
+def _create_program_with_events(client, headers, count):
+    program = client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "product_profile": {"product_type": "vape", "baseline_amount": 10, "unit_label": "puffs"},
+        },
+    )
+    assert program.status_code == 200
+    now = datetime.now(timezone.utc).isoformat()
+    batch = client.post(
+        "/api/v1/events/batch",
+        headers=headers,
+        json=[{"event_type": "craving", "intensity": 5, "occurred_at": now}] * count,
+    )
+    assert len(batch.json()["created"]) == count
+    return UUID(program.json()["id"])
+
+
+def _remaining_rows(db_engine, user_id, program_id):
+    db = sessionmaker(bind=db_engine)()
+    try:
+        return (
+            db.query(User).filter(User.id == user_id).count()
+            + db.query(Program).filter(Program.user_id == user_id).count()
+            + db.query(RefreshToken).filter(RefreshToken.user_id == user_id).count()
+            + db.query(Event).filter(Event.program_id == program_id).count()
+        )
+    finally:
+        db.close()
+
+
+def test_delete_profile_uses_set_based_deletes(client, db_engine, count_statements):
+    token = _register(client, f"{uuid4()}@example.com")
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = UUID(client.get("/api/v1/profile", headers=headers).json()["id"])
+    program_id = _create_program_with_events(client, headers, 40)
+
+    with count_statements() as statements:
+        deleted = client.delete("/api/v1/profile", headers=headers)
+
+    assert deleted.status_code == 200
+    assert len([statement for statement in statements if statement.startswith("DELETE")]) == 8
+    assert not [statement for statement in statements if statement.startswith("SELECT events.")]
+    assert _remaining_rows(db_engine, user_id, program_id) == 0
+
+
+def test_delete_large_profile_purges_in_background_chunks(client, db_engine, monkeypatch):
+    monkeypatch.setattr(profile, "SessionLocal", sessionmaker(autocommit=False, autoflush=False, bind=db_engine))
+    monkeypatch.setattr(settings, "account_delete_background_threshold", 10)
+    monkeypatch.setattr(settings, "account_delete_batch_size", 7)
+    email = f"{uuid4()}@example.com"
+    token = _register(client, email)
+    headers = {"Authorization": f"Bearer {token}"}
+    user_id = UUID(client.get("/api/v1/profile", headers=headers).json()["id"])
+    program_id = _create_program_with_events(client, headers, 25)
+
+    deleted = client.delete("/api/v1/profile", headers=headers)
+    assert deleted.status_code == 202
+    assert deleted.json()["detail"] == "scheduled"
+
+    # TestClient runs background tasks before returning the response.
+    assert _remaining_rows(db_engine, user_id, program_id) == 0
+    assert client.get("/api/v1/profile", headers=headers).status_code == 401
+    assert client.post("/api/v1/auth/register", json={"email": email, "password": "StrongPass1!"}).status_code == 200
+
+
+def test_deactivated_account_cannot_log_in_while_purge_is_pending(client, db_engine):
+    email = f"{uuid4()}@example.com"
+    token = _register(client, email)
+    user_id = UUID(client.get("/api/v1/profile", headers={"Authorization": f"Bearer {token}"}).json()["id"])
+    suspended_headers = {"Authorization": f"Bearer {_register(client, f'{uuid4()}@example.com')}"}
+    suspended_id = UUID(client.get("/api/v1/profile", headers=suspended_headers).json()["id"])
+
+    SessionLocal = sessionmaker(bind=db_engine)
+    db = SessionLocal()
+    try:
+        deactivate_account(db, user_id)
+        db.get(User, suspended_id).is_active = False
+        db.commit()
+        pending = pending_account_ids(db)
+        assert user_id in pending
+        # Deactivated for another reason: never picked up by the purge.
+        assert suspended_id not in pending
+    finally:
+        db.close()
+
+    login = client.post("/api/v1/auth/login", json={"email": email, "password": "StrongPass1!"})
+    assert login.status_code == 401
+
+    counts = purge_account_in_chunks(SessionLocal, user_id)
+    assert counts["users"] == 1
@@ -1,5 +1,9 @@
 from datetime import datetime, timedelta, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import sessionmaker
+
+from app.services.active_program import active_program_cache, load_active_program
 
 
 def _auth_header(client):
@@ -44,3 +48,45 @@ def test_update_active_product_profile_cost(client):
     body = update.json()
     assert body["product_profile"]["cost_per_unit"] == 2.75
 
+
+def test_active_program_loads_profile_in_one_query(client, db_engine, count_statements):
+    headers = _auth_header(client)
+    create = _create_program(client, headers)
+    assert create.status_code == 200
+    program_id = create.json()["id"]
+
+    me = client.get("/api/v1/profile", headers=headers).json()
+    active_program_cache.clear()
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        with count_statements() as statements:
+            program = load_active_program(db, UUID(me["id"]))
+            assert str(program.id) == program_id
+            assert float(program.product_profile.baseline_amount) == 12
+            assert load_active_program(db, UUID(me["id"])) is program
+    finally:
+        db.close()
+    assert len(statements) == 1
+
+
+def test_active_program_cache_is_invalidated_by_writes(client):
+    headers = _auth_header(client)
+    assert _create_program(client, headers).status_code == 200
+
+    before = client.get("/api/v1/programs/active", headers=headers)
+    assert before.json()["product_profile"]["cost_per_unit"] == 1.5
+
+    update = client.patch(
+        "/api/v1/programs/active/product-profile",
+        headers=headers,
+        json={"cost_per_unit": 3.25},
+    )
+    assert update.status_code == 200
+    after = client.get("/api/v1/programs/active", headers=headers)
+    assert after.json()["product_profile"]["cost_per_unit"] == 3.25
+
+    reset = client.post("/api/v1/programs/active/test/reset-progress", headers=headers)
+    assert reset.status_code == 200
+    progress = client.get("/api/v1/progress", headers=headers)
+    assert progress.json()["days_since_start"] == 1
@@ -1,6 +1,16 @@
-﻿from datetime import datetime, timedelta, timezone
+﻿import random
+from datetime import datetime, timedelta, timezone
 from uuid import uuid4
 
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Event, ProductProfile, Program, User
+from app.services.progress import (
+    calculate_progress,
+    calculate_progress_from_aggregates,
+    load_progress_aggregates,
+)
+
 
 def _auth_header(client):
     register = client.post(
@@ -51,3 +61,47 @@ def test_progress_endpoint(client):
     body = progress.json()
     assert "progress_percent" in body
     assert body["baseline_daily_amount"] == 20
+
+
+def test_aggregate_progress_matches_event_based_calculation(db_engine):
+    db = sessionmaker(bind=db_engine)()
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    try:
+        user = User(email=f"{uuid4()}@example.com", password_hash="x")
+        program = Program(user=user, goal_type="reduce_to_zero", started_at=now - timedelta(days=40))
+        program.product_profile = ProductProfile(product_type="vape", baseline_amount=300, unit_label="puffs")
+        db.add(program)
+        for _ in range(3000):
+            event_type = rng.choices(["use", "craving", "relapse"], weights=[300, 197, 3])[0]
+            db.add(
+                Event(
+                    program=program,
+                    event_type=event_type,
+                    amount=None if event_type == "craving" else round(rng.uniform(0.5, 3), 2),
+                    intensity=rng.randint(1, 10),
+                    occurred_at=now - timedelta(seconds=rng.randint(-3600, 35 * 86400)),
+                )
+            )
+        db.commit()
+
+        recent_events = db.query(Event).filter(
+            Event.program_id == program.id, Event.occurred_at >= now - timedelta(days=7)
+        ).all()
+        relapse_events = db.query(Event).filter(
+            Event.program_id == program.id,
+            Event.event_type == "relapse",
+            Event.occurred_at >= now - timedelta(days=30),
+        ).all()
+        expected = calculate_progress(program, recent_events, relapse_events, now)
+
+        aggregates = load_progress_aggregates(db, program.id, now)
+        actual = calculate_progress_from_aggregates(program, aggregates, now)
+    finally:
+        db.close()
+
+    assert actual["recent_average_daily_amount"] == expected["recent_average_daily_amount"]
+    assert abs(actual["relapse_penalty"] - expected["relapse_penalty"]) <= 0.0001
+    assert abs(actual["progress_percent"] - expected["progress_percent"]) <= 0.01
+    assert 0 < actual["relapse_penalty"] < 0.3
+    assert aggregates.relapses == len(relapse_events)
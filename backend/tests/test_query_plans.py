@@ -0,0 +1,230 @@
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base, get_db
+from app.main import create_app
+from app.models.models import DiaryEntry, Event, ProductProfile, Program, User
+from app.security.jwt import create_access_token
+from app.services.active_program import load_active_program_row
+from app.services.daily_stats import load_progress_aggregates_from_rollup, rebuild_daily_stats
+from app.services.dashboard import load_dashboard_state
+from app.services.progress import load_progress_aggregates
+from app.services.snapshots import load_snapshot_inputs
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+# SQLite's name for the (program_id, day) primary key of the rollup table.
+ROLLUP_KEY_INDEX = "sqlite_autoindex_event_daily_stats_1"
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+
+def _seed(db) -> tuple:
+    """A few users with three programs each, the last one active, with events, diary entries and rollups."""
+    rng = random.Random(7)
+    program_ids = []
+    user_ids = []
+    for u in range(40):
+        user = User(email=f"plan-{u}@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+        user_ids.append(user.id)
+        for p in range(3):
+            program = Program(
+                user_id=user.id,
+                goal_type="reduce_to_zero",
+                started_at=NOW - timedelta(days=60),
+                is_active=p == 2,
+            )
+            program.product_profile = ProductProfile(product_type="vape", baseline_amount=20, unit_label="puffs")
+            db.add(program)
+            db.flush()
+            program_ids.append(program.id)
+            for day in range(30):
+                db.add(DiaryEntry(program_id=program.id, entry_date=date(2026, 1, 1) + timedelta(days=day), mood=5))
+            db.add_all(
+                Event(
+                    program_id=program.id,
+                    event_type=rng.choice(["use", "craving", "craving", "relapse"]),
+                    amount=rng.randint(1, 5),
+                    intensity=rng.randint(1, 10),
+                    occurred_at=NOW - timedelta(minutes=rng.randint(0, 60 * 24 * 60)),
+                )
+                for _ in range(60)
+            )
+    db.commit()
+    rebuild_daily_stats(db)
+    db.commit()
+    return program_ids[-1], user_ids[-1]
+
+
+@pytest.fixture(scope="module")
+def seeded(tmp_path_factory):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    program_id, user_id = _seed(db)
+    with engine.connect() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    yield engine, db, program_id, user_id
+    db.close()
+    engine.dispose()
+
+
+def _capture(engine, run) -> list[tuple]:
+    """Run ``run`` and return every ``(statement, parameters)`` it sent to ``engine``."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    return captured
+
+
+def _explain(db, statement, parameters) -> str:
+    rows = db.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return " | ".join(row[-1] for row in rows)
+
+
+def _plan(engine, db, run) -> str:
+    """Run ``run`` and return SQLite's EXPLAIN QUERY PLAN for the last statement it emitted."""
+    statement, parameters = _capture(engine, run)[-1]
+    return _explain(db, statement, parameters)
+
+
+def _api_plans(seeded, path: str, table: str) -> list[str]:
+    """Plans of the statements a GET on ``path`` sends that read ``table``."""
+    engine, db, _, user_id = seeded
+    session_factory = sessionmaker(bind=engine)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app = create_app()
+    app.dependency_overrides[get_db] = override_get_db
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token(str(user_id))}"}
+
+    def request():
+        response = client.get(path, headers=headers)
+        assert response.status_code == 200, response.text
+
+    statements = [
+        (statement, parameters)
+        for statement, parameters in _capture(engine, request)
+        if f"FROM {table}" in statement
+    ]
+    assert statements, f"{path} sent no statement reading {table}"
+    return [_explain(db, statement, parameters) for statement, parameters in statements]
+
+
+def _assert_indexed(plan: str, table: str, index: str) -> None:
+    assert f"SCAN {table}" not in plan, plan
+    assert index in plan, plan
+
+
+def test_active_program_lookup_uses_partial_index(seeded):
+    engine, db, _, user_id = seeded
+    plan = _plan(engine, db, lambda: load_active_program_row(db, user_id))
+    _assert_indexed(plan, "programs", "ix_programs_user_active")
+
+
+def test_dashboard_statement_uses_partial_index_rollup_and_event_indexes(seeded):
+    engine, db, _, user_id = seeded
+    plan = _plan(engine, db, lambda: load_dashboard_state(db, user_id, NOW))
+    _assert_indexed(plan, "programs", "ix_programs_user_active")
+    _assert_indexed(plan, "event_daily_stats", ROLLUP_KEY_INDEX)
+    _assert_indexed(plan, "events", "ix_events_program_occurred")
+    assert "ix_events_program_type_occurred" in plan, plan
+
+
+def test_rollup_aggregate_columns_read_by_index(seeded):
+    engine, db, program_id, _ = seeded
+    plan = _plan(engine, db, lambda: load_progress_aggregates_from_rollup(db, program_id, NOW))
+    _assert_indexed(plan, "event_daily_stats", ROLLUP_KEY_INDEX)
+    _assert_indexed(plan, "events", "ix_events_program_occurred")
+    assert "ix_events_program_type_occurred" in plan, plan
+
+
+def test_snapshot_inputs_search_rollup_per_program(seeded):
+    engine, db, _, _ = seeded
+    plan = _plan(engine, db, lambda: load_snapshot_inputs(db, NOW))
+    _assert_indexed(plan, "event_daily_stats", ROLLUP_KEY_INDEX)
+    _assert_indexed(plan, "events", "ix_events_program_occurred")
+
+
+def test_progress_aggregate_query_uses_index(seeded):
+    engine, db, program_id, _ = seeded
+    plan = _plan(engine, db, lambda: load_progress_aggregates(db, program_id, NOW))
+    _assert_indexed(plan, "events", "ix_events_program_occurred")
+
+
+def test_list_endpoints_use_indexes(seeded):
+    for plan in _api_plans(seeded, "/api/v1/events?event_type=craving&limit=20", "events"):
+        _assert_indexed(plan, "events", "ix_events_program_type_occurred")
+    for plan in _api_plans(seeded, "/api/v1/events?limit=20", "events"):
+        _assert_indexed(plan, "events", "ix_events_program_occurred")
+    for plan in _api_plans(seeded, "/api/v1/diary?limit=20", "diary_entries"):
+        assert "SCAN diary_entries" not in plan, plan
+
+
+def test_bootstrap_lists_use_indexes(seeded):
+    for plan in _api_plans(seeded, "/api/v1/bootstrap", "events"):
+        assert "SCAN events" not in plan, plan
+    for plan in _api_plans(seeded, "/api/v1/bootstrap", "diary_entries"):
+        assert "SCAN diary_entries" not in plan, plan
+
+
+@pytest.mark.postgres
+@pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+def test_postgres_dashboard_reads_events_by_index_only_scan():
+    """The covering indexes' INCLUDE columns only exist on PostgreSQL, so check them there.
+
+    Runs in a throwaway schema of the ``TEST_POSTGRES_URL`` database.
+    """
+    schema = f"plans_{uuid4().hex[:12]}"
+    admin = create_engine(POSTGRES_URL, isolation_level="AUTOCOMMIT")
+    with admin.connect() as conn:
+        conn.exec_driver_sql(f"CREATE SCHEMA {schema}")
+    engine = create_engine(POSTGRES_URL, connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        Base.metadata.create_all(bind=engine)
+        db = sessionmaker(bind=engine)()
+        try:
+            _, user_id = _seed(db)
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                # Index-only scans need the visibility map that VACUUM sets.
+                conn.exec_driver_sql("VACUUM ANALYZE")
+
+            statement, parameters = _capture(engine, lambda: load_dashboard_state(db, user_id, NOW))[-1]
+            # The seeded tables are small enough that a sequential scan would win on cost.
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+            rows = db.connection().exec_driver_sql(f"EXPLAIN {statement}", parameters).all()
+            plan = "\n".join(row[0] for row in rows)
+            assert "Index Only Scan using ix_events_program_occurred" in plan, plan
+            assert "Index Only Scan using ix_events_program_type_occurred" in plan, plan
+            assert "Seq Scan on events" not in plan, plan
+        finally:
+            db.close()
+    finally:
+        engine.dispose()
+        with admin.connect() as conn:
+            conn.exec_driver_sql(f"DROP SCHEMA {schema} CASCADE")
+        admin.dispose()
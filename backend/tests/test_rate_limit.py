@@ -0,0 +1,175 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints import auth
+from app.config import settings
+from app.db.session import get_db
+from app.main import create_app
+from app.security import rate_limit
+from app.security.rate_limit import Limit, RedisRateLimitBackend
+
+
+def _register(client, email=None):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": email or f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    assert register.status_code == 200
+    return {"Authorization": f"Bearer {register.json()['access_token']}"}
+
+
+def test_login_is_limited_per_account_before_hashing(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_auth_account_burst", 2)
+    email = f"{uuid4()}@example.com"
+    _register(client, email)
+
+    verifications = []
+    real_verify = auth.verify_and_update_password
+
+    async def counting_verify(password, password_hash):
+        verifications.append(password)
+        return await real_verify(password, password_hash)
+
+    monkeypatch.setattr(auth, "verify_and_update_password", counting_verify)
+    statuses = [
+        client.post("/api/v1/auth/login", json={"email": email, "password": "WrongPass1!"}).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [401, 401, 429]
+    assert len(verifications) == 2
+
+    blocked = client.post("/api/v1/auth/login", json={"email": email.upper(), "password": "StrongPass1!"})
+    assert blocked.status_code == 429
+    assert blocked.json() == {"error": "Too many requests"}
+    assert int(blocked.headers["retry-after"]) >= 1
+
+    other = client.post("/api/v1/auth/login", json={"email": f"{uuid4()}@example.com", "password": "x"})
+    assert other.status_code == 401
+
+
+def test_auth_routes_are_limited_per_ip(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_auth_ip_burst", 3)
+    statuses = [
+        client.post("/api/v1/auth/login", json={"email": f"{uuid4()}@example.com", "password": "x"}).status_code
+        for _ in range(4)
+    ]
+    assert statuses == [401, 401, 401, 429]
+
+
+def test_spoofed_forwarded_for_does_not_reset_ip_bucket(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_auth_ip_burst", 2)
+    monkeypatch.setattr(settings, "rate_limit_trusted_proxies", 1)
+
+    def login(forwarded_for):
+        return client.post(
+            "/api/v1/auth/login",
+            headers={"X-Forwarded-For": forwarded_for},
+            json={"email": f"{uuid4()}@example.com", "password": "x"},
+        ).status_code
+
+    # The proxy appends the real peer (203.0.113.7); the left part is client-supplied.
+    statuses = [login(f"10.0.0.{i}, 203.0.113.7") for i in range(3)]
+    assert statuses == [401, 401, 429]
+    assert login("203.0.113.8") == 401
+
+
+def test_startup_warns_without_trusted_proxies_in_production(monkeypatch, caplog):
+    monkeypatch.setattr(settings, "environment", "production")
+    monkeypatch.setattr(settings, "rate_limit_trusted_proxies", 0)
+    with caplog.at_level("WARNING", logger="app.main"):
+        create_app()
+    assert "RATE_LIMIT_TRUSTED_PROXIES is 0" in caplog.text
+
+    caplog.clear()
+    monkeypatch.setattr(settings, "rate_limit_trusted_proxies", 1)
+    with caplog.at_level("WARNING", logger="app.main"):
+        create_app()
+    assert "RATE_LIMIT_TRUSTED_PROXIES" not in caplog.text
+
+
+def test_oversized_auth_body_is_limited_by_ip_only(monkeypatch):
+    monkeypatch.setattr(rate_limit, "MAX_ACCOUNT_BODY_BYTES", 10)
+    chunks = [b'{"email": ', b'"a@example.com", ', b'"password": "x"}']
+    received = []
+
+    async def receive():
+        body = chunks.pop(0)
+        received.append(body)
+        return {"type": "http.request", "body": body, "more_body": bool(chunks)}
+
+    async def run():
+        email, replay = await rate_limit._email_from_body(receive)
+        replayed = [await replay(), await replay()]
+        return email, replayed
+
+    email, replayed = asyncio.run(run())
+    assert email is None
+    # Reading stopped once the cap was passed; the app gets the rest unbuffered.
+    assert replayed[0] == {"type": "http.request", "body": b'{"email": "a@example.com", ', "more_body": True}
+    assert replayed[1]["body"] == b'"password": "x"}'
+    assert len(received) == 3
+
+
+def test_writes_are_limited_per_account(client, monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_write_burst", 2)
+    first = _register(client)
+    second = _register(client)
+    profile = {"display_name": "Sam"}
+
+    assert [client.patch("/api/v1/me", headers=first, json=profile).status_code for _ in range(3)] == [200, 200, 429]
+    assert client.patch("/api/v1/me", headers=second, json=profile).status_code == 200
+    assert client.get("/api/v1/me", headers=first).status_code == 200
+
+
+def test_shared_backend_holds_limits_across_workers(db_engine, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(settings, "rate_limit_auth_ip_burst", 4)
+    monkeypatch.setattr(
+        rate_limit,
+        "build_backend",
+        lambda: rate_limit.RedisRateLimitBackend(fakeredis.FakeAsyncRedis(server=server)),
+    )
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=db_engine)
+
+    def override_get_db():
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    workers = []
+    for _ in range(2):
+        app = create_app()
+        app.dependency_overrides[get_db] = override_get_db
+        workers.append(TestClient(app))
+
+    payload = {"email": f"{uuid4()}@example.com", "password": "x"}
+    statuses = [workers[i % 2].post("/api/v1/auth/login", json=payload).status_code for i in range(5)]
+    assert statuses == [401, 401, 401, 401, 429]
+
+
+def test_redis_backend_falls_back_when_store_is_down():
+    class DownClient:
+        def register_script(self, script):
+            async def run(keys, args):
+                raise RedisConnectionError("connection refused")
+
+            return run
+
+    backend = RedisRateLimitBackend(DownClient())
+    limit = Limit(burst=1, per_minute=1)
+
+    async def take_twice():
+        return [await backend.take("login:ip:1.2.3.4", limit) for _ in range(2)]
+
+    (first, _), (second, retry_after) = asyncio.run(take_twice())
+    assert first and not second
+    assert 0 < retry_after <= 60
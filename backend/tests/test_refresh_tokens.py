@@ -0,0 +1,147 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1.endpoints import auth
+from app.config import settings
+from app.db.session import Base
+from app.models.models import RefreshToken, User
+from app.schemas.auth import TokenRefresh
+from app.security.jwt import create_refresh_token, decode_token
+from app.services.refresh_tokens import purge_refresh_tokens
+
+
+def test_purge_deletes_expired_and_long_revoked_tokens_in_batches(db_engine):
+    db = sessionmaker(bind=db_engine)()
+    now = datetime.now(timezone.utc)
+    try:
+        user = User(email=f"{uuid4()}@example.com", password_hash="x")
+        db.add(user)
+        db.flush()
+
+        def token(expires_in, revoked_ago=None):
+            return RefreshToken(
+                user_id=user.id,
+                jti=uuid4().hex,
+                expires_at=now + expires_in,
+                revoked_at=None if revoked_ago is None else now - revoked_ago,
+            )
+
+        expired = [token(timedelta(days=-1)) for _ in range(5)]
+        long_revoked = [token(timedelta(days=20), revoked_ago=timedelta(days=10)) for _ in range(3)]
+        recently_revoked = token(timedelta(days=29), revoked_ago=timedelta(hours=1))
+        live = token(timedelta(days=30))
+        db.add_all([*expired, *long_revoked, recently_revoked, live])
+        db.commit()
+        kept = {recently_revoked.jti, live.jti}
+
+        result = purge_refresh_tokens(db, now, batch_size=3, revoked_retention=timedelta(days=7))
+        remaining = {row.jti for row in db.query(RefreshToken).filter(RefreshToken.user_id == user.id)}
+    finally:
+        db.close()
+
+    assert (result.expired, result.revoked, result.batches) == (5, 3, 3)
+    assert remaining == kept
+
+
+def test_login_caps_live_refresh_tokens_per_user(client, db_engine, monkeypatch):
+    monkeypatch.setattr(settings, "refresh_token_max_live_per_user", 2)
+    credentials = {"email": f"{uuid4()}@example.com", "password": "StrongPass1!"}
+    tokens = [client.post("/api/v1/auth/register", json=credentials).json()["refresh_token"]]
+    for _ in range(3):
+        tokens.append(client.post("/api/v1/auth/login", json=credentials).json()["refresh_token"])
+    jtis = [decode_token(token)["jti"] for token in tokens]
+
+    db = sessionmaker(bind=db_engine)()
+    try:
+        rows = db.query(RefreshToken).filter(RefreshToken.jti.in_(jtis)).all()
+        revoked = {row.jti: row.revoked_at is not None for row in rows}
+    finally:
+        db.close()
+    assert [revoked[jti] for jti in jtis] == [True, True, False, False]
+
+
+def test_parallel_refreshes_with_one_token_have_exactly_one_winner(tmp_path):
+    engine = create_engine(
+        f"sqlite+pysqlite:///{tmp_path / 'refresh.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    SessionLocal = sessionmaker(bind=engine)
+
+    db = SessionLocal()
+    user = User(email=f"{uuid4()}@example.com", password_hash="x")
+    db.add(user)
+    db.flush()
+    token, jti = create_refresh_token(user.id)
+    db.add(RefreshToken(user_id=user.id, jti=jti, expires_at=datetime.now(timezone.utc) + timedelta(days=1)))
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    workers = 8
+    barrier = threading.Barrier(workers)
+    outcomes = []
+
+    def attempt():
+        session = SessionLocal()
+        try:
+            barrier.wait()
+            auth.refresh(TokenRefresh(refresh_token=token), db=session)
+            outcomes.append("won")
+        except HTTPException as exc:
+            outcomes.append(exc.status_code)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=attempt) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    db = SessionLocal()
+    try:
+        rows = db.query(RefreshToken).filter(RefreshToken.user_id == user_id).all()
+    finally:
+        db.close()
+        engine.dispose()
+
+    assert sorted(outcomes, key=str) == [401] * (workers - 1) + ["won"]
+    assert len(rows) == 2
+    old = next(row for row in rows if row.jti == jti)
+    assert old.revoked_at is not None
+    assert old.replaced_by == next(row.jti for row in rows if row.jti != jti)
+
+
+def test_refresh_rotates_once(client):
+    credentials = {"email": f"{uuid4()}@example.com", "password": "StrongPass1!"}
+    token = client.post("/api/v1/auth/register", json=credentials).json()["refresh_token"]
+
+    rotated = client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+    assert rotated.status_code == 200
+    replayed = client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+    assert replayed.status_code == 401
+    assert replayed.json()["error"] == "Invalid token"
+    new_token = rotated.json()["refresh_token"]
+    assert client.post("/api/v1/auth/refresh", json={"refresh_token": new_token}).status_code == 200
+
+
+def test_refresh_with_expired_token_reports_expiry(client, db_engine):
+    credentials = {"email": f"{uuid4()}@example.com", "password": "StrongPass1!"}
+    token = client.post("/api/v1/auth/register", json=credentials).json()["refresh_token"]
+    db = sessionmaker(bind=db_engine)()
+    try:
+        row = db.query(RefreshToken).filter(RefreshToken.jti == decode_token(token)["jti"]).one()
+        row.expires_at = datetime.now(timezone.utc) - timedelta(minutes=1)
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.post("/api/v1/auth/refresh", json={"refresh_token": token})
+    assert response.status_code == 401
+    assert response.json()["error"] == "Token expired"
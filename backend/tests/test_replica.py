@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.db import session as db_session
+from app.db.replica import recent_writes
+from app.db.session import Base
+
+
+def _auth_header(client):
+    register = client.post(
+        "/api/v1/auth/register",
+        json={"email": f"{uuid4()}@example.com", "password": "StrongPass1!"},
+    )
+    token = register.json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _empty_replica():
+    engine = create_engine(
+        "sqlite+pysqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def test_reads_fall_back_to_primary_without_replica(client):
+    headers = _auth_header(client)
+    assert db_session.ReadSessionLocal is None
+
+    listed = client.get("/api/v1/programs", headers=headers)
+    assert listed.status_code == 200
+    assert listed.json() == []
+
+
+def test_reads_stay_on_primary_inside_read_your_writes_window(client, monkeypatch):
+    # The replica never receives the program, so reading from it returns no rows.
+    monkeypatch.setattr(db_session, "ReadSessionLocal", _empty_replica())
+    monkeypatch.setattr(settings, "replica_read_your_writes_seconds", 60)
+    recent_writes.clear()
+
+    headers = _auth_header(client)
+    program = client.post(
+        "/api/v1/programs",
+        headers=headers,
+        json={
+            "goal_type": "reduce_to_zero",
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "product_profile": {"product_type": "snus", "baseline_amount": 8, "unit_label": "pouches"},
+        },
+    )
+    assert program.status_code == 200
+
+    assert len(client.get("/api/v1/programs", headers=headers).json()) == 1
+    # A worker that did not handle the write still finds it on the primary.
+    recent_writes.clear()
+    assert len(client.get("/api/v1/programs", headers=headers).json()) == 1
+
+    monkeypatch.setattr(settings, "replica_read_your_writes_seconds", 0)
+    assert client.get("/api/v1/programs", headers=headers).json() == []
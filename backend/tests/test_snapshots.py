@@ -0,0 +1,61 @@
+import random
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Event, ProductProfile, Program, ProgressSnapshot, User
+from app.services.daily_stats import rebuild_daily_stats
+from app.services.progress import calculate_progress_from_aggregates, load_progress_aggregates
+from app.services.snapshots import run_progress_snapshots
+
+
+def test_snapshots_match_per_program_calculation(db_engine):
+    db = sessionmaker(bind=db_engine)()
+    rng = random.Random(3)
+    now = datetime.now(timezone.utc)
+    try:
+        programs = []
+        for index in range(6):
+            user = User(email=f"{uuid4()}@example.com", password_hash="x")
+            program = Program(
+                user=user,
+                goal_type="reduce_to_zero" if index % 2 else "immediate_zero",
+                started_at=now - timedelta(days=rng.randint(0, 120), hours=rng.randint(0, 23)),
+            )
+            program.product_profile = ProductProfile(
+                product_type="vape", baseline_amount=rng.choice([0, 5, 20]), unit_label="puffs"
+            )
+            db.add(program)
+            for _ in range(rng.randint(0, 80)):
+                event_type = rng.choices(["use", "craving", "relapse"], weights=[60, 35, 5])[0]
+                db.add(
+                    Event(
+                        program=program,
+                        event_type=event_type,
+                        amount=None if event_type == "craving" else round(rng.uniform(0.5, 4), 2),
+                        occurred_at=now - timedelta(seconds=rng.randint(0, 40 * 86400)),
+                    )
+                )
+            programs.append(program)
+        db.commit()
+        # Events were inserted directly, bypassing the service that keeps the rollup current.
+        rebuild_daily_stats(db)
+        db.commit()
+
+        written = run_progress_snapshots(db, now)
+        db.commit()
+        assert written >= len(programs)
+
+        for program in programs:
+            expected = calculate_progress_from_aggregates(
+                program, load_progress_aggregates(db, program.id, now), now
+            )
+            snapshot = db.get(ProgressSnapshot, (program.id, now.date()))
+            assert snapshot.days_since_start == expected["days_since_start"]
+            assert float(snapshot.recent_average_daily_amount) == expected["recent_average_daily_amount"]
+            assert float(snapshot.relapse_penalty) == pytest.approx(expected["relapse_penalty"], abs=1e-4)
+            assert float(snapshot.progress_percent) == pytest.approx(expected["progress_percent"], abs=0.01)
+    finally:
+        db.close()